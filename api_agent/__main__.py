@@ -1,6 +1,9 @@
 """API Agent MCP Server - Universal GraphQL/REST to MCP gateway."""
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastmcp import FastMCP
@@ -10,7 +13,9 @@ from starlette.responses import JSONResponse
 from starlette.routing import Route
 
 from .config import settings
+from .graphql import client as graphql_client
 from .middleware import DynamicToolNamingMiddleware
+from .rest import client as rest_client
 from .tools import register_all_tools
 
 logging.basicConfig(
@@ -20,9 +25,18 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[dict]:
+    """Close the shared keep-alive HTTP clients on shutdown."""
+    try:
+        yield {}
+    finally:
+        await asyncio.gather(graphql_client.aclose_client(), rest_client.aclose_client())
+
+
 def create_app():
     """Create MCP server application."""
-    mcp = FastMCP(settings.MCP_NAME)
+    mcp = FastMCP(settings.MCP_NAME, lifespan=lifespan)
     register_all_tools(mcp)
     mcp.add_middleware(DynamicToolNamingMiddleware())
 
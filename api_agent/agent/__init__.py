@@ -1,6 +1,19 @@
 """Agents for NL to API conversion."""
 
-from .graphql_agent import process_query
-from .rest_agent import process_rest_query
+import importlib
+from typing import Any
 
 __all__ = ["process_query", "process_rest_query"]
+
+# Imported on first access: each agent pulls in the agents SDK + openai stack,
+# and a request only needs the one matching its API type
+_LAZY = {
+    "process_query": ".graphql_agent",
+    "process_rest_query": ".rest_agent",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,20 @@
 """GraphQL agent using declarative queries (GraphQL + DuckDB SQL)."""
 
-import json
+import asyncio
+import functools
 import logging
 import re
 from contextvars import ContextVar
-from datetime import datetime
 from typing import Any
 
 from agents import Agent, MaxTurnsExceeded, Runner, function_tool
+from pydantic import BaseModel, Field
 
+from .. import json_utils
 from ..config import settings
-from ..context import RequestContext
+from ..context import AgentState, RequestContext
 from ..executor import (
+    SQLSession,
     execute_sql,
     extract_tables_from_response,
     truncate_for_context,
@@ -35,6 +38,7 @@ from ..recipe import (
     validate_and_prepare_recipe,
     validate_recipe_params,
 )
+from ..schema_cache import SchemaCache, schema_cache_key
 from ..tracing import trace_metadata
 from .contextvar_utils import safe_append_contextvar_list, safe_get_contextvar
 from .model import get_run_config, model
@@ -51,8 +55,9 @@ from .prompts import (
     SQL_TOOL_DESC,
     TOOL_USAGE_RULES,
     UNCERTAINTY_SPEC,
+    current_date,
 )
-from .schema_search import create_search_schema_tool
+from .schema_search import SchemaIndex, create_search_schema_tool
 
 logger = logging.getLogger(__name__)
 
@@ -66,28 +71,46 @@ def _log(msg: str) -> None:
 # Context-local storage (isolated per async request)
 # NOTE: Use mutable containers for values that need to be modified by tool functions,
 # because ContextVar.set() in child tasks (task groups) doesn't propagate to parent.
-_graphql_queries: ContextVar[list[str]] = ContextVar("graphql_queries")
+# Request-bound tools read ctx.state directly; _query_results/_last_result alias the same
+# objects for module-level tools (sql_query) and the shared recipe helpers.
 _recipe_steps: ContextVar[list[dict[str, Any]]] = ContextVar("recipe_steps")
 _query_results: ContextVar[dict[str, Any]] = ContextVar("query_results")
 _last_result: ContextVar[list] = ContextVar("last_result")  # Mutable container: [result_value]
-_raw_schema: ContextVar[str] = ContextVar("raw_schema")  # Raw introspection JSON for search
+# Raw introspection JSON for recipes and search, serialized on first use
+_raw_schema: ContextVar[json_utils.LazyDump] = ContextVar("raw_schema")
+_schema_index: ContextVar[SchemaIndex] = ContextVar("schema_index")  # search_schema line index
 _sql_steps: ContextVar[list[str]] = ContextVar("sql_steps")
+_sql_session: ContextVar[SQLSession] = ContextVar("sql_session")  # DuckDB conn reused per request
+
+# Process-wide schema cache: (endpoint, headers) -> (sdl_context, raw_schema_json)
+_schema_cache = SchemaCache()
 
 
 def _format_type(t: dict | None) -> str:
     """Convert introspection type to compact notation: [User!]!"""
     if not t:
         return "?"
-    kind = t.get("kind")
-    name = t.get("name")
-    inner = t.get("ofType")
 
-    if kind == "NON_NULL":
-        return f"{_format_type(inner)}!"
-    if kind == "LIST":
-        return f"[{_format_type(inner)}]"
-    return name or "?"
+    # Unroll the NON_NULL/LIST wrapper chain iteratively, then wrap the leaf once
+    wrappers: list[bool] = []  # True = NON_NULL, False = LIST (outermost first)
+    cur: dict | None = t
+    while cur:
+        kind = cur.get("kind")
+        if kind == "NON_NULL":
+            wrappers.append(True)
+        elif kind == "LIST":
+            wrappers.append(False)
+        else:
+            break
+        cur = cur.get("ofType")
+
+    out = (cur.get("name") if cur else None) or "?"
+    for non_null in reversed(wrappers):
+        out = f"{out}!" if non_null else f"[{out}]"
+    return out
+
 
+_SCHEMA_TRUNCATED_MARKER = "[SCHEMA TRUNCATED - use search_schema() to explore]"
 
 _INTROSPECTION_QUERY = """{
   __schema {
@@ -136,86 +159,132 @@ def _format_arg(a: dict) -> str:
     return f"{a['name']}: {type_str}"
 
 
-def _filter_required_args(args: list[dict]) -> list[dict]:
-    """Filter to only required arguments (NON_NULL type)."""
-    return [a for a in args if _is_required(a.get("type"))]
+def _desc_comment(item: dict, descriptions: bool = True) -> str:
+    """' # description' suffix on one line; empty when disabled or blank."""
+    text = item.get("description") if descriptions else None
+    if not text:
+        return ""
+    text = " ".join(text.split())  # Multi-line descriptions would break one-line-per-def
+    return f" # {text}" if text else ""
 
 
-def _format_field(fld: dict) -> str:
+def _format_field(fld: dict, descriptions: bool = True) -> str:
     """Format a field with optional args."""
-    args = fld.get("args", [])
-    if args:
-        arg_str = "(" + ", ".join(_format_arg(a) for a in args) + ")"
-    else:
-        arg_str = ""
-    desc = f" # {fld['description']}" if fld.get("description") else ""
+    args = fld.get("args")
+    arg_str = f"({', '.join(map(_format_arg, args))})" if args else ""
+    desc = _desc_comment(fld, descriptions)
     return f"  {fld['name']}{arg_str}: {_format_type(fld['type'])}{desc}"
 
 
-def _build_schema_context(schema: dict) -> str:
-    """Build compact SDL context from introspection schema."""
+class _SchemaBudgetExceeded(Exception):
+    """Raised internally when SDL output exceeds its character budget."""
+
+
+_ROOT_TYPE_NAMES = frozenset(("Query", "Mutation", "Subscription"))
+
+
+def _build_schema_context(
+    schema: dict,
+    max_chars: int | None = None,
+    descriptions: bool = True,
+) -> str:
+    """Build compact SDL context from introspection schema.
+
+    Every output line goes onto one flat list, joined once at the end.
+
+    Args:
+        schema: Introspection `__schema` dict
+        max_chars: Stop emitting once output would exceed this many chars and
+            append _SCHEMA_TRUNCATED_MARKER instead (None = unbounded)
+        descriptions: Include " # ..." description comments
+    """
     queries = schema.get("queryType", {}).get("fields", [])
-    all_types = [t for t in schema.get("types", []) if not t["name"].startswith("__")]
-
-    objects = [
-        t
-        for t in all_types
-        if t["kind"] == "OBJECT" and t["name"] not in ("Query", "Mutation", "Subscription")
-    ]
-    enums = [t for t in all_types if t["kind"] == "ENUM"]
-    inputs = [t for t in all_types if t["kind"] == "INPUT_OBJECT"]
-    interfaces = [t for t in all_types if t["kind"] == "INTERFACE"]
-    unions = [t for t in all_types if t["kind"] == "UNION"]
-
-    lines = ["<queries>"]
-    for f in queries:
-        desc = f" # {f['description']}" if f.get("description") else ""
-        # Only show required args
-        required_args = _filter_required_args(f.get("args", []))
-        args = ", ".join(_format_arg(a) for a in required_args)
-        lines.append(f"{f['name']}({args}) -> {_format_type(f['type'])}{desc}")
-
-    if interfaces:
-        lines.append("\n<interfaces>")
-        for t in interfaces:
-            impl = [p["name"] for p in t.get("possibleTypes", []) or []]
-            impl_str = f" # implemented by: {', '.join(impl)}" if impl else ""
-            fields = [_format_field(fld) for fld in t.get("fields", []) or []]
-            lines.append(f"{t['name']} {{{impl_str}\n" + "\n".join(fields) + "\n}")
-
-    if unions:
-        lines.append("\n<unions>")
-        for t in unions:
-            types = [p["name"] for p in t.get("possibleTypes", []) or []]
-            lines.append(f"{t['name']}: {' | '.join(types)}")
-
-    lines.append("\n<types>")
-    for t in objects:
-        impl = [i["name"] for i in t.get("interfaces", []) or []]
-        impl_str = f" implements {', '.join(impl)}" if impl else ""
-        fields = [_format_field(fld) for fld in t.get("fields", []) or []]
-        lines.append(f"{t['name']}{impl_str} {{\n" + "\n".join(fields) + "\n}")
-
-    lines.append("\n<enums>")
-    for e in enums:
-        vals = " | ".join(v["name"] for v in e.get("enumValues", []))
-        lines.append(f"{e['name']}: {vals}")
-
-    lines.append("\n<inputs>")
-    for inp in inputs:
-        # Only show required input fields
-        required_fields = [
-            f for f in (inp.get("inputFields", []) or []) if _is_required(f.get("type"))
-        ]
-        fields = ", ".join(f"{f['name']}: {_format_type(f['type'])}" for f in required_fields)
-        lines.append(f"{inp['name']} {{ {fields} }}")
 
-    return "\n".join(lines)
+    # Bucket types by kind in one pass over the schema
+    objects: list[dict] = []
+    enums: list[dict] = []
+    inputs: list[dict] = []
+    interfaces: list[dict] = []
+    unions: list[dict] = []
+    buckets = {
+        "OBJECT": objects,
+        "ENUM": enums,
+        "INPUT_OBJECT": inputs,
+        "INTERFACE": interfaces,
+        "UNION": unions,
+    }
+    for t in schema.get("types", []):
+        name = t["name"]
+        if name.startswith("__"):
+            continue
+        bucket = buckets.get(t["kind"])
+        if bucket is None or (bucket is objects and name in _ROOT_TYPE_NAMES):
+            continue
+        bucket.append(t)
 
+    lines: list[str] = []
+    total = -1  # Running length of "\n".join(lines)
 
-def _strip_descriptions(context: str) -> str:
-    """Strip # comments from SDL context."""
-    return re.sub(r" #[^\n]*", "", context)
+    def emit(line: str) -> None:
+        nonlocal total
+        total += len(line) + 1
+        if max_chars is not None and total > max_chars:
+            raise _SchemaBudgetExceeded
+        lines.append(line)
+
+    try:
+        emit("<queries>")
+        for f in queries:
+            desc = _desc_comment(f, descriptions)
+            # Only show required args (filtered and formatted in one pass)
+            args = ", ".join(
+                _format_arg(a) for a in f.get("args") or () if _is_required(a.get("type"))
+            )
+            emit(f"{f['name']}({args}) -> {_format_type(f['type'])}{desc}")
+
+        if interfaces:
+            emit("\n<interfaces>")
+            for t in interfaces:
+                impl = [p["name"] for p in t.get("possibleTypes", []) or []]
+                impl_str = f" # implemented by: {', '.join(impl)}" if descriptions and impl else ""
+                emit(f"{t['name']} {{{impl_str}")
+                for fld in t.get("fields", []) or []:
+                    emit(_format_field(fld, descriptions))
+                emit("}")
+
+        if unions:
+            emit("\n<unions>")
+            for t in unions:
+                types = [p["name"] for p in t.get("possibleTypes", []) or []]
+                emit(f"{t['name']}: {' | '.join(types)}")
+
+        emit("\n<types>")
+        for t in objects:
+            impl = [i["name"] for i in t.get("interfaces", []) or []]
+            impl_str = f" implements {', '.join(impl)}" if impl else ""
+            emit(f"{t['name']}{impl_str} {{")
+            for fld in t.get("fields", []) or []:
+                emit(_format_field(fld, descriptions))
+            emit("}")
+
+        emit("\n<enums>")
+        for e in enums:
+            vals = " | ".join(v["name"] for v in e.get("enumValues", []))
+            emit(f"{e['name']}: {vals}")
+
+        emit("\n<inputs>")
+        for inp in inputs:
+            # Only show required input fields
+            fields = ", ".join(
+                f"{f['name']}: {_format_type(f['type'])}"
+                for f in inp.get("inputFields") or ()
+                if _is_required(f.get("type"))
+            )
+            emit(f"{inp['name']} {{ {fields} }}")
+    except _SchemaBudgetExceeded:
+        lines.append(_SCHEMA_TRUNCATED_MARKER)
+
+    return "\n".join(lines)
 
 
 def _is_depth_limit_error(result: dict) -> bool:
@@ -228,8 +297,13 @@ def _is_depth_limit_error(result: dict) -> bool:
     return False
 
 
-async def _fetch_schema_context(endpoint: str, headers: dict[str, str] | None) -> str:
-    """Fetch schema in compact SDL format. Falls back to shallow query on depth limit."""
+async def _load_schema_context(
+    endpoint: str, headers: dict[str, str] | None
+) -> tuple[str, json_utils.LazyDump | None]:
+    """Introspect schema. Returns (sdl_context, raw_schema_json), ("", None) on failure.
+
+    Falls back to shallow query on depth limit.
+    """
     result = await graphql_fetch(_INTROSPECTION_QUERY, None, endpoint, headers)
 
     # Retry with shallow introspection if depth limit exceeded
@@ -238,36 +312,51 @@ async def _fetch_schema_context(endpoint: str, headers: dict[str, str] | None) -
         result = await graphql_fetch(_INTROSPECTION_QUERY_SHALLOW, None, endpoint, headers)
 
     if not result.get("success") or not result.get("data"):
-        return ""
+        return "", None
 
     schema = result["data"]["__schema"]
 
-    # Store raw introspection JSON for grep-like search (preserves all info)
-    _raw_schema.set(json.dumps(schema, indent=2))
+    # Raw introspection JSON for grep-like search (preserves all info), kept as UTF-8 bytes.
+    # Serialized only when search_schema or recipe hashing first reads it.
+    raw_json = json_utils.LazyDump(schema, indent=True)  # Indented: search_schema is line-based
 
-    # Build DSL for LLM context
-    context = _build_schema_context(schema)
+    # Build DSL for LLM context, dropping descriptions before truncating definitions
+    context = _build_schema_context(schema, max_chars=settings.MAX_SCHEMA_CHARS)
+    if context.endswith(_SCHEMA_TRUNCATED_MARKER):
+        context = _build_schema_context(
+            schema, max_chars=settings.MAX_SCHEMA_CHARS, descriptions=False
+        )
 
-    if len(context) > settings.MAX_SCHEMA_CHARS:
-        context = _strip_descriptions(context)
-        if len(context) > settings.MAX_SCHEMA_CHARS:
-            context = (
-                context[: settings.MAX_SCHEMA_CHARS]
-                + "\n[SCHEMA TRUNCATED - use search_schema() to explore]"
-            )
+    return context, raw_json
 
-    return context
 
+async def _fetch_schema_context(
+    endpoint: str, headers: dict[str, str] | None
+) -> tuple[str, json_utils.LazyDump | None]:
+    """Fetch schema in compact SDL format, reusing cached introspection within TTL.
 
-def _build_system_prompt(recipe_context: str = "") -> str:
-    """Build system prompt for GraphQL agent."""
-    current_date = datetime.now().strftime("%Y-%m-%d")
+    Returns:
+        (sdl_context, raw_schema_json). Caller stores raw JSON in `_raw_schema`
+        (this may run in a child task, where ContextVar.set() wouldn't propagate).
+    """
+    return await _schema_cache.get_or_load(
+        schema_cache_key(endpoint, headers),
+        lambda: _load_schema_context(endpoint, headers),
+        cacheable=lambda result: result[1] is not None,
+    )
+
+
+def _escape_braces(text: str) -> str:
+    """Escape literal braces so a static fragment survives str.format()."""
+    return text.replace("{", "{{").replace("}", "}}")
 
-    workflow_start = "1"
 
-    return f"""You are a GraphQL API agent that answers questions by querying APIs and returning data.
+# Assembled once at import; only current_date, max_turns and recipe_context are left unbound.
+# Static instructions come first and per-request parts (date, recipes) last, so the
+# prefix stays byte-identical across requests for provider-side prompt caching.
+_SYSTEM_PROMPT_TEMPLATE = f"""You are a GraphQL API agent that answers questions by querying APIs and returning data.
 
-{SQL_RULES}
+{_escape_braces(SQL_RULES)}
 
 ## GraphQL-Specific
 - Use inline values, never $variables
@@ -277,42 +366,146 @@ graphql_query(query, name?, return_directly?)
   Execute GraphQL query. Result stored as DuckDB table.
   - return_directly: Skip LLM analysis, return raw data directly to user
 
-{SQL_TOOL_DESC}
+graphql_query_batch(queries, return_directly?)
+  Execute several independent queries in ONE request. queries = [{{{{name, query}}}}, ...]
+  - Each query selects exactly one root field; name = table name
+  - Prefer over multiple graphql_query calls when fetching independent datasets
 
-{SEARCH_TOOL_DESC}
+{_escape_braces(SQL_TOOL_DESC)}
+
+{_escape_braces(SEARCH_TOOL_DESC)}
 </tools>
 <workflow>
-{workflow_start}. Read <queries> and <types> provided below
-{int(workflow_start) + 1}. Execute graphql_query with needed fields
-{int(workflow_start) + 2}. If user needs filtering/aggregation → sql_query, else return data
+1. Read <queries> and <types> provided below
+2. Execute graphql_query with needed fields
+3. If user needs filtering/aggregation → sql_query, else return data
 </workflow>
 
-{CONTEXT_SECTION.format(current_date=current_date, max_turns=settings.MAX_AGENT_TURNS)}
-
-{recipe_context}
-
-{DECISION_GUIDANCE}
+{_escape_braces(DECISION_GUIDANCE)}
 
-{GRAPHQL_SCHEMA_NOTATION}
+{_escape_braces(GRAPHQL_SCHEMA_NOTATION)}
 
-{UNCERTAINTY_SPEC}
+{_escape_braces(UNCERTAINTY_SPEC)}
 
-{OPTIONAL_PARAMS_SPEC}
+{_escape_braces(OPTIONAL_PARAMS_SPEC)}
 
-{PERSISTENCE_SPEC.format(max_turns=settings.MAX_AGENT_TURNS)}
+{PERSISTENCE_SPEC}
 
-{EFFECTIVE_PATTERNS}
+{_escape_braces(EFFECTIVE_PATTERNS)}
 
-{TOOL_USAGE_RULES}
+{_escape_braces(TOOL_USAGE_RULES)}
 
 <examples>
-Simple: graphql_query('{{ users(limit: 10) {{ id name }} }}')
-Aggregation: graphql_query('{{ posts {{ authorId views }} }}'); sql_query('SELECT authorId, SUM(views) as total FROM data GROUP BY authorId')
-Join: graphql_query('{{ users {{ id name }} }}', name='u'); graphql_query('{{ posts {{ authorId title }} }}', name='p'); sql_query('SELECT u.name, p.title FROM u JOIN p ON u.id = p.authorId')
+Simple: graphql_query('{{{{ users(limit: 10) {{{{ id name }}}} }}}}')
+Aggregation: graphql_query('{{{{ posts {{{{ authorId views }}}} }}}}'); sql_query('SELECT authorId, SUM(views) as total FROM data GROUP BY authorId')
+Join: graphql_query_batch([{{{{"name": "u", "query": "{{{{ users {{{{ id name }}}} }}}}"}}}}, {{{{"name": "p", "query": "{{{{ posts {{{{ authorId title }}}} }}}}"}}}}]); sql_query('SELECT u.name, p.title FROM u JOIN p ON u.id = p.authorId')
 </examples>
+
+{CONTEXT_SECTION}
+
+{{recipe_context}}
 """
 
 
+def _build_system_prompt(recipe_context: str = "") -> str:
+    """Build system prompt for GraphQL agent (cached per day + recipe context)."""
+    return _render_system_prompt(current_date(), recipe_context)
+
+
+@functools.lru_cache(maxsize=32)
+def _render_system_prompt(today: str, recipe_context: str) -> str:
+    """Render GraphQL system prompt. Pure in its args, so safe to memoize."""
+    return _SYSTEM_PROMPT_TEMPLATE.format(
+        current_date=today,
+        max_turns=settings.MAX_AGENT_TURNS,
+        recipe_context=recipe_context,
+    )
+
+
+# Max chars of raw data echoed back when a response has no extractable table
+_RESULT_PREVIEW_CHARS = 1000
+
+
+def _store_query_result(
+    state: AgentState, data: Any, name: str
+) -> tuple[Any, dict[str, Any] | None]:
+    """Store response data as table `name` for sql_query.
+
+    Returns:
+        (stored_data, schema_info)
+    """
+    tables, schema_info = extract_tables_from_response(data, name)
+    state.results.update(tables)
+    # Store full data for final response (the extracted list)
+    # Mutate in-place so changes propagate from task group child
+    stored_data = tables.get(name)
+    if stored_data is not None:
+        state.last_result[0] = stored_data
+    return stored_data, schema_info
+
+
+# Valid GraphQL alias / table name
+_GRAPHQL_NAME_RE = re.compile(r"^[_A-Za-z][_0-9A-Za-z]*$")
+# Leading "query" keyword + optional operation name
+_QUERY_PREFIX_RE = re.compile(r"^\s*(?:query\b\s*[_A-Za-z0-9]*)?\s*")
+_ROOT_FIELD_RE = re.compile(r"\s*(?:([_A-Za-z]\w*)\s*:\s*)?[_A-Za-z]\w*\s*")
+_EXISTING_ALIAS_RE = re.compile(r"^\s*[_A-Za-z]\w*\s*:\s*")
+
+
+def _alias_root_field(query: str, alias: str) -> str | None:
+    """Rewrite single-root query `{ users { id } }` to aliased selection `alias: users { id }`.
+
+    Returns None unless the query selects exactly one root field.
+    """
+    body = _QUERY_PREFIX_RE.sub("", query, count=1).strip()
+    if not (body.startswith("{") and body.endswith("}")):
+        return None
+    inner = body[1:-1].strip()
+
+    # Collect top-level text only (nested args/selections and strings skipped)
+    top: list[str] = []
+    depth = 0
+    in_str = False
+    escaped = False
+    for ch in inner:
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+            continue
+        if ch == '"':
+            in_str = True
+        elif ch in "({":
+            depth += 1
+            if depth == 1:
+                top.append(" ")
+        elif ch in ")}":
+            depth -= 1
+            if depth < 0:
+                return None
+        elif depth == 0:
+            top.append(ch)
+    if depth or in_str:
+        return None
+
+    match = _ROOT_FIELD_RE.fullmatch("".join(top))
+    if not match:
+        return None
+    if match.group(1):
+        inner = _EXISTING_ALIAS_RE.sub("", inner, count=1)
+    return f"{alias}: {inner}"
+
+
+class GraphQLBatchItem(BaseModel):
+    """One query in a graphql_query_batch call."""
+
+    name: str = Field(description="Table name for sql_query (also the field alias)")
+    query: str = Field(description="GraphQL query selecting exactly one root field")
+
+
 def _create_graphql_query_tool(ctx: RequestContext):
     """Create graphql_query tool with bound context."""
 
@@ -330,59 +523,139 @@ def _create_graphql_query_tool(ctx: RequestContext):
             JSON string with query results
         """
         result = await graphql_fetch(query, None, ctx.target_url, ctx.target_headers)
+        ctx.state.queries.append(query)
 
-        schema_info = None
-        stored_data = None
-        if result.get("success"):
-            try:
-                results = _query_results.get()
-                data = result.get("data", {})
-                tables, schema_info = extract_tables_from_response(data, name)
-                results.update(tables)
-                _query_results.set(results)
-                # Store full data for final response (the extracted list)
-                # Mutate in-place so changes propagate from task group child
-                stored_data = tables.get(name)
-                if stored_data is not None:
-                    _last_result.get()[0] = stored_data
-            except LookupError:
-                pass
-
-            # Track successful step for recipe extraction
-            safe_append_contextvar_list(
-                _recipe_steps, {"kind": "graphql", "query": query, "name": name}
-            )
+        if settings.DEBUG:  # Skip building the preview when _log would drop it
+            _log(f"RESULT {json_utils.preview(result)}")
+
+        if not result.get("success"):
+            return json_utils.dumps(result)
 
-        safe_append_contextvar_list(_graphql_queries, query)
+        data = result.get("data", {})
+        stored_data, schema_info = _store_query_result(ctx.state, data, name)
 
-        _log(f"RESULT {json.dumps(result)[:200]}")
+        # Track successful step for recipe extraction
+        safe_append_contextvar_list(
+            _recipe_steps, {"kind": "graphql", "query": query, "name": name}
+        )
 
-        if return_directly and result.get("success"):
+        if return_directly:
             _set_return_directly()
 
         # Smart context optimization - cap by chars for LLM safety
-        if result.get("success") and stored_data:
+        if stored_data:
             # Wrapped dict (1-row) → return schema info
             if schema_info:
-                return json.dumps(
-                    {"success": True, "table": name, **schema_info},
-                    indent=2,
-                )
+                return json_utils.dumps({"success": True, "table": name, **schema_info})
 
             # Apply char-based truncation (normalized format)
             if isinstance(stored_data, list):
-                return json.dumps(
-                    {"success": True, **truncate_for_context(stored_data, name)},
-                    indent=2,
+                return json_utils.dumps(
+                    {"success": True, **truncate_for_context(stored_data, name)}
                 )
 
-        return json.dumps(result, indent=2)
+        # No list to tabulate: summarize instead of re-serializing the whole response
+        return json_utils.dumps(
+            {
+                "success": True,
+                "table": name,
+                "preview": json_utils.preview(data, _RESULT_PREVIEW_CHARS),
+            }
+        )
 
     return graphql_query
 
 
+def _create_graphql_batch_tool(ctx: RequestContext):
+    """Create graphql_query_batch tool with bound context."""
+
+    def _error(msg: str) -> str:
+        return json_utils.dumps({"success": False, "error": msg})
+
+    @function_tool
+    async def graphql_query_batch(
+        queries: list[GraphQLBatchItem], return_directly: bool = False
+    ) -> str:
+        """Execute several independent GraphQL queries in a single request.
+
+        Each query's root field is aliased to its name and merged into one document,
+        then each aliased result is stored as its own table for sql_query.
+
+        Args:
+            queries: List of {name, query}; each query selects exactly one root field
+            return_directly: Skip LLM processing, return data directly to client.
+                            Only applies on success. Errors still processed by LLM.
+
+        Returns:
+            JSON string with per-table results
+        """
+        if not queries:
+            return _error("queries must not be empty")
+
+        selections: list[str] = []
+        seen: set[str] = set()
+        for item in queries:
+            if not _GRAPHQL_NAME_RE.match(item.name):
+                return _error(f"invalid name '{item.name}' (letters, digits, _ only)")
+            if item.name in seen:
+                return _error(f"duplicate name '{item.name}'")
+            seen.add(item.name)
+            selection = _alias_root_field(item.query, item.name)
+            if selection is None:
+                return _error(
+                    f"query for '{item.name}' must select exactly one root field. "
+                    "Use graphql_query for other shapes."
+                )
+            selections.append(selection)
+
+        document = "{\n" + "\n".join(f"  {sel}" for sel in selections) + "\n}"
+        result = await graphql_fetch(document, None, ctx.target_url, ctx.target_headers)
+
+        ctx.state.queries.append(document)
+
+        if settings.DEBUG:
+            _log(f"BATCH RESULT {json_utils.preview(result)}")
+
+        if not result.get("success"):
+            return json_utils.dumps(result)
+
+        data = result.get("data") or {}
+        budget = settings.MAX_TOOL_RESPONSE_CHARS // len(queries)
+        tables: dict[str, Any] = {}
+        for item in queries:
+            value = data.get(item.name)
+            stored_data, schema_info = _store_query_result(ctx.state, {item.name: value}, item.name)
+
+            # Track each query as its own step for recipe extraction
+            safe_append_contextvar_list(
+                _recipe_steps, {"kind": "graphql", "query": item.query, "name": item.name}
+            )
+
+            if schema_info:
+                tables[item.name] = {"table": item.name, **schema_info}
+            elif isinstance(stored_data, list):
+                tables[item.name] = truncate_for_context(stored_data, item.name, budget)
+            else:
+                tables[item.name] = {
+                    "table": item.name,
+                    "preview": json_utils.preview(value, _RESULT_PREVIEW_CHARS),
+                }
+
+        if return_directly:
+            _set_return_directly()
+
+        return json_utils.dumps({"success": True, "tables": tables})
+
+    return graphql_query_batch
+
+
+def _create_graphql_tools(ctx: RequestContext) -> tuple:
+    """Create (graphql_query, graphql_query_batch) tools with bound context."""
+    return _create_graphql_query_tool(ctx), _create_graphql_batch_tool(ctx)
+
+
 # Create search_schema tool bound to GraphQL schema context var
-search_schema = create_search_schema_tool(_raw_schema)
+search_schema = create_search_schema_tool(_schema_index)
 
 
 @function_tool
@@ -399,14 +672,16 @@ def sql_query(sql: str, return_directly: bool = False) -> str:
     try:
         data = _query_results.get()
     except LookupError:
-        return json.dumps({"success": False, "error": "No data. Call graphql_query first."})
+        return json_utils.dumps({"success": False, "error": "No data. Call graphql_query first."})
 
     if not data:
-        return json.dumps({"success": False, "error": "No data. Call graphql_query first."})
+        return json_utils.dumps({"success": False, "error": "No data. Call graphql_query first."})
 
-    result = execute_sql(data, sql)
+    session = safe_get_contextvar(_sql_session, None)
+    result = session.execute(data, sql) if session else execute_sql(data, sql)
 
-    _log(f"SQL {json.dumps(result)[:200]}")
+    if settings.DEBUG:
+        _log(f"SQL {json_utils.preview(result)}")
 
     # Store full result for final response + apply char truncation for LLM
     if result.get("success"):
@@ -424,12 +699,9 @@ def sql_query(sql: str, return_directly: bool = False) -> str:
             _set_return_directly()
 
         if isinstance(rows, list):
-            return json.dumps(
-                {"success": True, **truncate_for_context(rows, "sql_result")},
-                indent=2,
-            )
+            return json_utils.dumps({"success": True, **truncate_for_context(rows, "sql_result")})
 
-    return json.dumps(result, indent=2)
+    return json_utils.dumps(result)
 
 
 def _create_individual_recipe_tools(
@@ -461,7 +733,7 @@ def _create_individual_recipe_tools(
                     return error
 
                 recipe, validated_params, error = validate_and_prepare_recipe(
-                    rid, json.dumps(kwargs), _raw_schema
+                    rid, json_utils.dumps(kwargs), _raw_schema
                 )
                 if error:
                     return error
@@ -471,9 +743,7 @@ def _create_individual_recipe_tools(
                         return (
                             False,
                             None,
-                            json.dumps(
-                                {"success": False, "error": "invalid recipe step"}, indent=2
-                            ),
+                            json_utils.dumps({"success": False, "error": "invalid recipe step"}),
                             None,
                         )
 
@@ -483,9 +753,7 @@ def _create_individual_recipe_tools(
                         return (
                             False,
                             None,
-                            json.dumps(
-                                {"success": False, "error": "missing query_template"}, indent=2
-                            ),
+                            json_utils.dumps({"success": False, "error": "missing query_template"}),
                             None,
                         )
 
@@ -495,9 +763,8 @@ def _create_individual_recipe_tools(
                         return (
                             False,
                             None,
-                            json.dumps(
-                                {"success": False, "error": res.get("error", "query failed")},
-                                indent=2,
+                            json_utils.dumps(
+                                {"success": False, "error": res.get("error", "query failed")}
                             ),
                             None,
                         )
@@ -505,8 +772,7 @@ def _create_individual_recipe_tools(
                     data = res.get("data", {})
                     tables, _ = extract_tables_from_response(data, str(name))
                     results.update(tables)
-                    _query_results.set(results)
-                    safe_append_contextvar_list(_graphql_queries, query)
+                    ctx.state.queries.append(query)
                     return True, tables.get(str(name)), "", query
 
                 executed_queries: list[str] = []
@@ -551,37 +817,45 @@ async def process_query(question: str, ctx: RequestContext) -> dict[str, Any]:
         question: Natural language question
         ctx: Request context with target_url and target_headers
     """
+    sql_session: SQLSession | None = None
     try:
         _log(f"QUERY {question[:80]}")
 
         # Reset per-request storage
         # Use mutable containers so tool functions can modify in-place
         # (ContextVar.set() in child tasks doesn't propagate to parent)
-        _graphql_queries.set([])
+        state = ctx.state
         _recipe_steps.set([])
         _sql_steps.set([])
-        _query_results.set({})
-        _last_result.set([None])  # Mutable list: [result_value]
+        _query_results.set(state.results)
+        _last_result.set(state.last_result)
         _return_directly_flag.set([])  # Reset direct return flag
+        sql_session = SQLSession()
+        _sql_session.set(sql_session)
         reset_progress()  # Reset turn counter
 
-        # Fetch schema with dynamic endpoint
-        schema_ctx = await _fetch_schema_context(ctx.target_url, ctx.target_headers)
+        # Fetch schema while building schema-independent tools in a worker thread
+        (schema_ctx, raw_schema_json), (gql_tool, gql_batch_tool) = await asyncio.gather(
+            _fetch_schema_context(ctx.target_url, ctx.target_headers),
+            asyncio.to_thread(_create_graphql_tools, ctx),
+        )
+        if raw_schema_json:
+            _raw_schema.set(raw_schema_json)
+            _schema_index.set(SchemaIndex(raw_schema_json))
 
-        # Pre-flight recipe search
+        # Pre-flight recipe search (only path that needs the raw JSON up front, for its hash)
         suggestions, recipe_context = [], ""
-        if settings.ENABLE_RECIPES:
-            raw_schema = safe_get_contextvar(_raw_schema, "")
+        raw_schema = b""
+        if settings.ENABLE_RECIPES and raw_schema_json:
+            raw_schema = raw_schema_json()
             api_id = build_api_id(ctx, "graphql")
             suggestions, recipe_context = search_recipes(api_id, raw_schema, question)
             if suggestions:
                 _log(f"PRE-FLIGHT found={len(suggestions)} ids={[s['recipe_id'] for s in suggestions]}")
-            elif raw_schema:
+            else:
                 _log(f"PRE-FLIGHT no matches for api_id={api_id[:50]}")
 
-        # Create tools with bound context
-        gql_tool = _create_graphql_query_tool(ctx)
-        tools = [gql_tool, sql_query, search_schema]
+        tools = [gql_tool, gql_batch_tool, sql_query, search_schema]
         if suggestions:  # Create individual recipe tools for each suggestion
             recipe_tools = _create_individual_recipe_tools(ctx, suggestions)
             tools = [*recipe_tools, *tools]
@@ -611,14 +885,14 @@ async def process_query(question: str, ctx: RequestContext) -> dict[str, Any]:
                     run_config=get_run_config(),
                 )
 
-            queries = _graphql_queries.get()
-            last_data = _last_result.get()[0]
+            queries = state.queries
+            last_data = state.last_result[0]
             turn_info = get_turn_context(settings.MAX_AGENT_TURNS)
 
         except MaxTurnsExceeded:
             # Return partial results when turn limit exceeded
-            queries = _graphql_queries.get()
-            last_data = _last_result.get()[0]
+            queries = state.queries
+            last_data = state.last_result[0]
             turn_info = get_turn_context(settings.MAX_AGENT_TURNS)
             return build_partial_result(last_data, queries, turn_info, "queries")
 
@@ -662,7 +936,7 @@ async def process_query(question: str, ctx: RequestContext) -> dict[str, Any]:
             question=question,
             steps=safe_get_contextvar(_recipe_steps, []),
             sql_steps=safe_get_contextvar(_sql_steps, []),
-            raw_schema=safe_get_contextvar(_raw_schema, ""),
+            raw_schema=raw_schema,
         )
 
         return {
@@ -681,3 +955,6 @@ async def process_query(question: str, ctx: RequestContext) -> dict[str, Any]:
             "queries": [],
             "error": str(e),
         }
+    finally:
+        if sql_session is not None:
+            sql_session.close()
@@ -1,5 +1,24 @@
 """Shared prompt components for API agents."""
 
+import time
+from datetime import datetime, timedelta
+
+# (expires_at epoch seconds, "YYYY-MM-DD") - refreshed at local midnight
+_date_cache: tuple[float, str] = (0.0, "")
+
+
+def current_date() -> str:
+    """Today's local date as YYYY-MM-DD, formatted at most once per day."""
+    global _date_cache
+    expires_at, date_str = _date_cache
+    if time.time() >= expires_at:
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        date_str = now.date().isoformat()
+        _date_cache = (midnight.timestamp(), date_str)
+    return date_str
+
+
 # Context section with date and limits
 CONTEXT_SECTION = """<context>
 Today's date: {current_date}
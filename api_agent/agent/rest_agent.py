@@ -1,17 +1,20 @@
 """REST agent using declarative queries (REST API + DuckDB SQL)."""
 
 import asyncio
+import functools
 import json
 import logging
+import random
 from contextvars import ContextVar
-from datetime import datetime
-from typing import Any
+from typing import Any, Callable
 
 from agents import Agent, MaxTurnsExceeded, Runner, function_tool
 
+from .. import json_utils
 from ..config import settings
-from ..context import RequestContext
+from ..context import CallRecord, RequestContext
 from ..executor import (
+    SQLSession,
     execute_sql,
     extract_tables_from_response,
     truncate_for_context,
@@ -53,8 +56,9 @@ from .prompts import (
     SQL_TOOL_DESC,
     TOOL_USAGE_RULES,
     UNCERTAINTY_SPEC,
+    current_date,
 )
-from .schema_search import create_search_schema_tool
+from .schema_search import SchemaIndex, create_search_schema_tool
 
 logger = logging.getLogger(__name__)
 
@@ -68,12 +72,15 @@ def _log(msg: str) -> None:
 # Context-local storage (isolated per async request)
 # NOTE: Use mutable containers for values that need to be modified by tool functions,
 # because ContextVar.set() in child tasks (task groups) doesn't propagate to parent.
-_rest_calls: ContextVar[list[dict[str, Any]]] = ContextVar("rest_calls")
 _recipe_steps: ContextVar[list[dict[str, Any]]] = ContextVar("recipe_steps")
 _query_results: ContextVar[dict[str, Any]] = ContextVar("query_results")
 _last_result: ContextVar[list] = ContextVar("last_result")  # Mutable container: [result_value]
-_raw_schema: ContextVar[str] = ContextVar("raw_schema")  # Raw OpenAPI JSON for search
+_raw_schema: ContextVar[str] = ContextVar("raw_schema")  # Raw OpenAPI JSON for recipes
+_schema_index: ContextVar[SchemaIndex] = ContextVar("schema_index")  # search_schema line index
 _sql_steps: ContextVar[list[str]] = ContextVar("sql_steps")
+_sql_session: ContextVar[SQLSession] = ContextVar("sql_session")  # DuckDB conn reused per request
+# (ctx, base_url) for rest_call/poll_until_done, which are built once at import
+_rest_target: ContextVar[tuple[RequestContext, str]] = ContextVar("rest_target")
 
 
 def _get_nested_value(data: dict | None, path: str) -> Any:
@@ -86,21 +93,30 @@ def _get_nested_value(data: dict | None, path: str) -> Any:
     Returns:
         Value at path or None if not found
     """
-    if not data or not path:
+    if not path:
+        return None
+    return _get_compiled_value(data, _compile_path(path))
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_path(path: str) -> tuple[tuple[str, int | None], ...]:
+    """Pre-split a dot path into (key, list_index_or_None) steps for repeated lookups.
+
+    Cached: agents poll the same few done_fields across calls and requests.
+    """
+    return tuple((key, int(key) if key.isdigit() else None) for key in path.split("."))
+
+
+def _get_compiled_value(data: dict | None, steps: tuple[tuple[str, int | None], ...]) -> Any:
+    """Walk a _compile_path() result. Same semantics as _get_nested_value."""
+    if not data:
         return None
-    keys = path.split(".")
     current: Any = data
-    for key in keys:
-        if not isinstance(current, (dict, list)):
-            return None
-        if isinstance(current, list) and key.isdigit():
-            idx = int(key)
-            if 0 <= idx < len(current):
-                current = current[idx]
-            else:
-                return None
-        elif isinstance(current, dict):
+    for key, idx in steps:
+        if isinstance(current, dict):
             current = current.get(key)
+        elif isinstance(current, list) and idx is not None:
+            current = current[idx] if idx < len(current) else None
         else:
             return None
         if current is None:
@@ -108,6 +124,31 @@ def _get_nested_value(data: dict | None, path: str) -> Any:
     return current
 
 
+def _compile_done_check(done_value: str) -> Callable[[Any], bool]:
+    """Build a matcher equivalent to str(current).lower() == done_value.lower().
+
+    bool/int values (the usual completion flags and counters) compare without str().
+    """
+    target = done_value.lower()
+    target_bool = {"true": True, "false": False}.get(target)
+    # Only canonical ints ("0", "-3"), so "05" still only matches the string "05"
+    try:
+        target_int = int(target) if str(int(target)) == target else None
+    except ValueError:
+        target_int = None
+
+    def check(current: Any) -> bool:
+        if isinstance(current, bool):
+            return current is target_bool
+        if type(current) is int:
+            return current == target_int
+        if isinstance(current, str):
+            return current.lower() == target
+        return str(current).lower() == target
+
+    return check
+
+
 def _set_nested_value(data: dict, path: str, value: Any) -> None:
     """Set value in nested dict using dot notation, creating intermediate dicts.
 
@@ -127,29 +168,53 @@ def _set_nested_value(data: dict, path: str, value: Any) -> None:
     current[keys[-1]] = value
 
 
+def _compile_set_path(data: dict, path: str) -> tuple[dict, str] | None:
+    """Resolve the parent dict of an existing, non-null value at a dot path.
+
+    Returns (parent, leaf_key) so repeated writes skip the walk from the root,
+    or None if any step is missing or not a dict.
+    """
+    *parents, leaf = path.split(".")
+    current: Any = data
+    for key in parents:
+        current = current.get(key) if isinstance(current, dict) else None
+    if not isinstance(current, dict) or current.get(leaf) is None:
+        return None
+    return current, leaf
+
+
 def _build_system_prompt(poll_paths: tuple[str, ...] = (), recipe_context: str = "") -> str:
-    """Build system prompt for REST agent.
+    """Build system prompt for REST agent (cached per day + poll paths + recipe context).
 
     Args:
         poll_paths: Paths that require polling (empty = no polling support)
         recipe_context: Pre-computed recipe suggestions to inject
     """
-    current_date = datetime.now().strftime("%Y-%m-%d")
+    return _render_system_prompt(tuple(poll_paths), current_date(), recipe_context)
 
-    poll_tool_desc = ""
-    poll_rules = ""
+
+@functools.lru_cache(maxsize=32)
+def _render_system_prompt(poll_paths: tuple[str, ...], today: str, recipe_context: str) -> str:
+    """Render REST system prompt. Pure in its args, so safe to memoize.
+
+    Ordered static -> per-API (polling) -> per-request (date, recipes) so the longest
+    possible prefix is byte-identical across requests for provider-side prompt caching.
+    """
+    poll_section = ""
     if poll_paths:
         paths_str = ", ".join(poll_paths)
-        poll_tool_desc = f"""
+        poll_section = f"""
+<polling-tool>
 poll_until_done(method, path, done_field, done_value, body?, name?, delay_ms?)
   Poll async API until done_field equals done_value.
   - done_field: dot-path (e.g., "status", "data.0.complete", "trips.0.isCompleted")
   - done_value: target value as string ("true", "COMPLETED")
-  - delay_ms: ms between polls (default: {settings.DEFAULT_POLL_DELAY_MS}ms)
+  - delay_ms: fixed ms between polls (default: starts at {settings.DEFAULT_POLL_DELAY_MS}ms, grows 1.5x up to {settings.MAX_POLL_DELAY_MS}ms)
   - Auto-increments polling.count if present in body
   Max {settings.MAX_POLLS} polls. Polling paths: {paths_str}
-"""
-        poll_rules = f"""
+  Example: poll_until_done("POST", "{poll_paths[0]}", done_field="isCompleted", done_value="true", body={{...}})
+</polling-tool>
+
 <polling-required>
 IMPORTANT: These paths are ASYNC and REQUIRE polling: {paths_str}
 - You MUST use poll_until_done (NOT rest_call) for these paths
@@ -158,39 +223,27 @@ IMPORTANT: These paths are ASYNC and REQUIRE polling: {paths_str}
 </polling-required>
 """
 
-    # Conditionally add polling example
-    poll_example = ""
-    if poll_paths:
-        poll_example = f"""Polling: poll_until_done("POST", "{poll_paths[0]}", done_field="isCompleted", done_value="true", body='{{...}}')
-"""
-
-    workflow_start = "1"
-
     return f"""You are a REST API agent that answers questions by querying APIs and returning data.
 
 {SQL_RULES}
 
 <tools>
 {REST_TOOL_DESC}
-{poll_tool_desc}
+
 {SQL_TOOL_DESC}
 
 {SEARCH_TOOL_DESC}
 </tools>
 <workflow>
-{workflow_start}. Read <endpoints> and <schemas> below
-{int(workflow_start) + 1}. Check if endpoint is in polling paths - if yes, use poll_until_done; otherwise use rest_call
-{int(workflow_start) + 2}. Use sql_query to filter/aggregate results
+1. Read <endpoints> and <schemas> below
+2. Check if endpoint is in polling paths - if yes, use poll_until_done; otherwise use rest_call
+3. Use sql_query to filter/aggregate results
 </workflow>
 
-{CONTEXT_SECTION.format(current_date=current_date, max_turns=settings.MAX_AGENT_TURNS)}
-
-{recipe_context}
-
 {DECISION_GUIDANCE}
 
 {REST_SCHEMA_NOTATION}
-{poll_rules}
+
 {UNCERTAINTY_SPEC}
 
 {OPTIONAL_PARAMS_SPEC}
@@ -202,275 +255,299 @@ IMPORTANT: These paths are ASYNC and REQUIRE polling: {paths_str}
 {TOOL_USAGE_RULES}
 
 <examples>
-GET: rest_call("GET", "/users", query_params='{{"limit": 10}}')
-Path param: rest_call("GET", "/users/{{{{id}}}}", path_params='{{"id": "123"}}')
-{poll_example}Join: rest_call("GET", "/users", name="u"); rest_call("GET", "/posts", name="p"); sql_query('SELECT u.name, p.title FROM u JOIN p ON u.id = p.userId')
+GET: rest_call("GET", "/users", query_params={{"limit": 10}})
+Path param: rest_call("GET", "/users/{{{{id}}}}", path_params={{"id": "123"}})
+Join: rest_call("GET", "/users", name="u"); rest_call("GET", "/posts", name="p"); sql_query('SELECT u.name, p.title FROM u JOIN p ON u.id = p.userId')
 </examples>
+{poll_section}
+{CONTEXT_SECTION.format(current_date=today, max_turns=settings.MAX_AGENT_TURNS)}
+
+{recipe_context}
 """
 
 
-def _create_rest_call_tool(ctx: RequestContext, base_url: str):
-    """Create rest_call tool with bound context."""
-
-    @function_tool
-    async def rest_call(
-        method: str,
-        path: str,
-        path_params: str = "",
-        query_params: str = "",
-        body: str = "",
-        name: str = "data",
-        return_directly: bool = False,
-    ) -> str:
-        """Execute REST API call and store result for sql_query.
-
-        Args:
-            method: HTTP method (GET recommended, others may be blocked)
-            path: API path (e.g., /users/{id})
-            path_params: JSON string for path values (e.g., '{"id": "123"}')
-            query_params: JSON string for query params (e.g., '{"limit": 10}')
-            body: JSON string for request body (e.g., '{"name": "John"}')
-            name: Table name for sql_query (default: "data")
-            return_directly: Skip LLM processing, return data directly to client.
-                            Only applies on success. Errors still processed by LLM.
-
-        Returns:
-            JSON string with API response
-        """
-        # Parse JSON params
-        pp = json.loads(path_params) if path_params else None
-        qp = json.loads(query_params) if query_params else None
-        bd = json.loads(body) if body else None
+def _json_arg(value: Any) -> Any:
+    """Structured tool argument as-is; a JSON string (legacy form) is parsed."""
+    if isinstance(value, str):
+        return json_utils.loads(value) if value else None
+    return value
+
+
+# Non-strict: free-form object params can't be expressed in a strict schema
+@function_tool(strict_mode=False)
+async def rest_call(
+    method: str,
+    path: str,
+    path_params: dict[str, Any] | str | None = None,
+    query_params: dict[str, Any] | str | None = None,
+    body: dict[str, Any] | list[Any] | str | None = None,
+    name: str = "data",
+    return_directly: bool = False,
+) -> str:
+    """Execute REST API call and store result for sql_query.
+
+    Args:
+        method: HTTP method (GET recommended, others may be blocked)
+        path: API path (e.g., /users/{id})
+        path_params: Path values object (e.g., {"id": "123"})
+        query_params: Query params object (e.g., {"limit": 10})
+        body: Request body object (e.g., {"name": "John"})
+        name: Table name for sql_query (default: "data")
+        return_directly: Skip LLM processing, return data directly to client.
+                        Only applies on success. Errors still processed by LLM.
+
+    Returns:
+        JSON string with API response
+    """
+    try:
+        ctx, base_url = _rest_target.get()
+    except LookupError:
+        return json_utils.dumps({"success": False, "error": "No REST request in progress"})
+    pp = _json_arg(path_params)
+    qp = _json_arg(query_params)
+    bd = _json_arg(body)
+
+    result = await execute_request(
+        method,
+        path,
+        pp,
+        qp,
+        bd,
+        base_url=base_url,
+        headers=ctx.target_headers,
+        allow_unsafe_paths=ctx.allow_unsafe_paths,
+    )
+
+    # Track call
+    ctx.state.api_calls.append(
+        CallRecord(
+            method=method,
+            path=path,
+            path_params=json_utils.dumps(pp) if pp else "",
+            query_params=json_utils.dumps(qp) if qp else "",
+            body=json_utils.dumps(bd) if bd else "",
+            name=name,
+            success=bool(result.get("success")),
+        )
+    )
+
+    # Store result for sql_query
+    schema_info = None
+    stored_data = None
+    if result.get("success"):
+        try:
+            results = _query_results.get()
+            data = result.get("data", {})
+            tables, schema_info = extract_tables_from_response(data, name)
+            # Mutate in-place (no .set()): the dict is the one process_rest_query
+            # bound, and changes propagate from task group children
+            results.update(tables)
+            # Store full data for final response (the extracted list)
+            stored_data = tables.get(name)
+            if stored_data is not None:
+                _last_result.get()[0] = stored_data
+
+            # Track successful step for recipe extraction
+            safe_append_contextvar_list(
+                _recipe_steps,
+                {
+                    "kind": "rest",
+                    "name": name,
+                    "method": method,
+                    "path": path,
+                    "path_params": pp,
+                    "query_params": qp,
+                    "body": bd,
+                },
+            )
+        except LookupError:
+            pass
+
+    if settings.DEBUG:  # Skip building the preview when _log would drop it
+        _log(f"RESULT {json_utils.preview(result)}")
+
+    if return_directly and result.get("success"):
+        _set_return_directly()
+
+    # Smart context optimization - cap by chars for LLM safety
+    if result.get("success") and stored_data:
+        # Wrapped dict (1-row) → return schema info
+        if schema_info:
+            return json_utils.dumps({"success": True, "table": name, **schema_info})
+
+        # Apply char-based truncation (normalized format)
+        if isinstance(stored_data, list):
+            return json_utils.dumps({"success": True, **truncate_for_context(stored_data, name)})
+
+    # Add hints on failure to guide agent recovery
+    if not result.get("success"):
+        status = result.get("status_code", 0)
+        # HTTP 4xx/5xx errors - suggest schema search for valid values
+        if status >= 400:
+            result["hint"] = "Use search_schema to find valid enum values or field names"
+
+    return json_utils.dumps(result)
+
+
+@function_tool(strict_mode=False)
+async def poll_until_done(
+    method: str,
+    path: str,
+    done_field: str,
+    done_value: str,
+    body: dict[str, Any] | str | None = None,
+    path_params: dict[str, Any] | str | None = None,
+    query_params: dict[str, Any] | str | None = None,
+    name: str = "poll_result",
+    delay_ms: int = 0,
+) -> str:
+    """Poll endpoint until done_field equals done_value. Auto-increments polling.count if present.
+
+    Args:
+        method: HTTP method (POST typically)
+        path: API path
+        done_field: Dot-path to check (e.g., "status", "polling.completed", "trips.0.isCompleted")
+        done_value: Value indicating done (e.g., "true", "0", "COMPLETED", "100")
+        body: Request body object
+        path_params: Path values object
+        query_params: Query params object
+        name: Table name for sql_query (default: poll_result)
+        delay_ms: Fixed delay between polls in ms (default: 3000ms, backs off 1.5x)
+
+    Returns:
+        JSON string with final response or error
+    """
+    try:
+        ctx, base_url = _rest_target.get()
+    except LookupError:
+        return json_utils.dumps({"success": False, "error": "No REST request in progress"})
+    pp = _json_arg(path_params)
+    qp = _json_arg(query_params)
+    try:
+        body_dict = _json_arg(body) or {}
+    except json.JSONDecodeError as e:
+        return json_utils.dumps(
+            {
+                "success": False,
+                "error": f"Invalid body JSON: {e.msg}",
+            }
+        )
+
+    # Internal defaults from config
+    loop = asyncio.get_running_loop()
+    max_polls = settings.MAX_POLLS
+    if delay_ms > 0:
+        # Agent-chosen interval is honored exactly: no backoff, no jitter
+        wait_ms = max_wait_ms = delay_ms
+        jitter = 0.0
+    else:
+        wait_ms = settings.DEFAULT_POLL_DELAY_MS
+        max_wait_ms = max(settings.MAX_POLL_DELAY_MS, wait_ms)
+        jitter = 0.1  # Up to +10% so concurrent default-paced pollers drift apart
+    current = None  # Track last done_field value for error messages
+    done_steps = _compile_path(done_field)  # Parsed once, checked on every poll
+    done_check = _compile_done_check(done_value)  # Built once, checked on every poll
+    # Call-log strings: params never change; body only when polling.count is bumped
+    pp_json = json_utils.dumps(pp) if pp else ""
+    qp_json = json_utils.dumps(qp) if qp else ""
+    body_json = json_utils.dumps(body_dict) if body_dict else ""
+    poll_count = _compile_set_path(body_dict, "polling.count")  # Bumped on every re-poll
+
+    attempt = 0
+    while attempt < max_polls:
+        attempt += 1
 
         result = await execute_request(
             method,
             path,
             pp,
             qp,
-            bd,
+            body=body_dict if body_dict else None,
             base_url=base_url,
             headers=ctx.target_headers,
-            allow_unsafe_paths=list(ctx.allow_unsafe_paths),
+            allow_unsafe_paths=ctx.allow_unsafe_paths,
         )
 
         # Track call
-        safe_append_contextvar_list(
-            _rest_calls,
-            {
-                "method": method,
-                "path": path,
-                "path_params": path_params,
-                "query_params": query_params,
-                "body": body,
-                "name": name,
-                "success": bool(result.get("success")),
-            },
+        ctx.state.api_calls.append(
+            CallRecord(
+                method=method,
+                path=path,
+                path_params=pp_json,
+                query_params=qp_json,
+                body=body_json,
+                name=name,
+                success=bool(result.get("success")),
+                poll_attempt=attempt,
+            )
         )
 
-        # Store result for sql_query
-        schema_info = None
-        stored_data = None
-        if result.get("success"):
-            try:
-                results = _query_results.get()
-                data = result.get("data", {})
-                tables, schema_info = extract_tables_from_response(data, name)
-                results.update(tables)
-                _query_results.set(results)
-                # Store full data for final response (the extracted list)
-                # Mutate in-place so changes propagate from task group child
-                stored_data = tables.get(name)
-                if stored_data is not None:
-                    _last_result.get()[0] = stored_data
-
-                # Track successful step for recipe extraction
-                safe_append_contextvar_list(
-                    _recipe_steps,
-                    {
-                        "kind": "rest",
-                        "name": name,
-                        "method": method,
-                        "path": path,
-                        "path_params": pp,
-                        "query_params": qp,
-                        "body": bd,
-                    },
-                )
-            except LookupError:
-                pass
-
-        _log(f"RESULT {json.dumps(result)[:200]}")
-
-        if return_directly and result.get("success"):
-            _set_return_directly()
-
-        # Smart context optimization - cap by chars for LLM safety
-        if result.get("success") and stored_data:
-            # Wrapped dict (1-row) → return schema info
-            if schema_info:
-                return json.dumps(
-                    {"success": True, "table": name, **schema_info},
-                    indent=2,
-                )
-
-            # Apply char-based truncation (normalized format)
-            if isinstance(stored_data, list):
-                return json.dumps(
-                    {"success": True, **truncate_for_context(stored_data, name)},
-                    indent=2,
-                )
-
-        # Add hints on failure to guide agent recovery
         if not result.get("success"):
-            status = result.get("status_code", 0)
-            # HTTP 4xx/5xx errors - suggest schema search for valid values
-            if status >= 400:
-                result["hint"] = "Use search_schema to find valid enum values or field names"
-
-        return json.dumps(result, indent=2)
-
-    return rest_call
-
-
-def _create_poll_tool(ctx: RequestContext, base_url: str):
-    """Create poll_until_done tool with bound context."""
-
-    @function_tool
-    async def poll_until_done(
-        method: str,
-        path: str,
-        done_field: str,
-        done_value: str,
-        body: str = "",
-        path_params: str = "",
-        query_params: str = "",
-        name: str = "poll_result",
-        delay_ms: int = 0,
-    ) -> str:
-        """Poll endpoint until done_field equals done_value. Auto-increments polling.count if present.
-
-        Args:
-            method: HTTP method (POST typically)
-            path: API path
-            done_field: Dot-path to check (e.g., "status", "polling.completed", "trips.0.isCompleted")
-            done_value: Value indicating done (e.g., "true", "0", "COMPLETED", "100")
-            body: JSON string request body
-            path_params: JSON string for path values
-            query_params: JSON string for query params
-            name: Table name for sql_query (default: poll_result)
-            delay_ms: Delay between polls in ms (default: 3000ms)
-
-        Returns:
-            JSON string with final response or error
-        """
-        pp = json.loads(path_params) if path_params else None
-        qp = json.loads(query_params) if query_params else None
-        try:
-            body_dict = json.loads(body) if body else {}
-        except json.JSONDecodeError as e:
-            return json.dumps(
+            return json_utils.dumps(
                 {
                     "success": False,
-                    "error": f"Invalid body JSON: {e.msg}",
+                    "error": result.get("error"),
+                    "attempt": attempt,
                 }
             )
 
-        # Internal defaults from config
-        max_polls = settings.MAX_POLLS
-        wait_ms = delay_ms if delay_ms > 0 else settings.DEFAULT_POLL_DELAY_MS
-        current = None  # Track last done_field value for error messages
-
-        attempt = 0
-        while attempt < max_polls:
-            attempt += 1
-
-            result = await execute_request(
-                method,
-                path,
-                pp,
-                qp,
-                body=body_dict if body_dict else None,
-                base_url=base_url,
-                headers=ctx.target_headers,
-                allow_unsafe_paths=list(ctx.allow_unsafe_paths),
-            )
+        data = result.get("data", {})
 
-            # Track call
-            safe_append_contextvar_list(
-                _rest_calls,
+        # Validate done_field exists on first response
+        current = _get_compiled_value(data, done_steps)
+        if current is None and attempt == 1:
+            keys = list(data.keys()) if isinstance(data, dict) else []
+            return json_utils.dumps(
                 {
-                    "method": method,
-                    "path": path,
-                    "path_params": path_params,
-                    "query_params": query_params,
-                    "body": json.dumps(body_dict) if body_dict else "",
-                    "name": name,
-                    "poll_attempt": attempt,
-                    "success": bool(result.get("success")),
-                },
+                    "success": False,
+                    "error": f"done_field '{done_field}' not found in response. Available keys: {keys}",
+                }
             )
 
-            if not result.get("success"):
-                return json.dumps(
-                    {
-                        "success": False,
-                        "error": result.get("error"),
-                        "attempt": attempt,
-                    }
-                )
-
-            data = result.get("data", {})
-
-            # Validate done_field exists on first response
-            current = _get_nested_value(data, done_field)
-            if current is None and attempt == 1:
-                keys = list(data.keys()) if isinstance(data, dict) else []
-                return json.dumps(
-                    {
-                        "success": False,
-                        "error": f"done_field '{done_field}' not found in response. Available keys: {keys}",
-                    }
-                )
+        # Check if done_field value matches done_value (string comparison semantics)
+        if done_check(current):
+            # Store result for sql_query
+            try:
+                results = _query_results.get()
+                tables, _ = extract_tables_from_response(data, name)
+                results.update(tables)
+                stored = tables.get(name)
+                if stored is not None:
+                    _last_result.get()[0] = stored
+            except LookupError:
+                pass
 
-            # Check if done_field value matches done_value (string comparison)
-            is_done = str(current).lower() == done_value.lower()
+            return json_utils.dumps(
+                {
+                    "success": True,
+                    **truncate_for_context(data if isinstance(data, list) else [data], name),
+                    "attempts": attempt,
+                }
+            )
 
-            if is_done:
-                # Store result for sql_query
-                try:
-                    results = _query_results.get()
-                    tables, _ = extract_tables_from_response(data, name)
-                    results.update(tables)
-                    stored = tables.get(name)
-                    if stored is not None:
-                        _last_result.get()[0] = stored
-                except LookupError:
-                    pass
-
-                return json.dumps(
-                    {
-                        "success": True,
-                        **truncate_for_context(data if isinstance(data, list) else [data], name),
-                        "attempts": attempt,
-                    },
-                    indent=2,
-                )
+        if attempt == max_polls:
+            break  # No point waiting after the last attempt
 
-            await asyncio.sleep(wait_ms / 1000)
+        # Prepare the next request inside the delay window instead of after it
+        deadline = loop.time() + wait_ms * (1 + random.uniform(0, jitter)) / 1000
+        # Exponential backoff (default pacing only): quick re-checks early, less load on slow jobs
+        wait_ms = min(wait_ms * 1.5, max_wait_ms)
 
-            # Auto-increment polling.count if present in body
-            if body_dict.get("polling", {}).get("count") is not None:
-                body_dict["polling"]["count"] += 1
+        # Auto-increment polling.count if present in body
+        if poll_count:
+            parent, key = poll_count
+            parent[key] += 1
+            body_json = json_utils.dumps(body_dict)
 
-        return json.dumps(
-            {
-                "success": False,
-                "error": f"max_polls ({max_polls}) exceeded. Last {done_field} value: {current} (expected: {done_value})",
-                "attempts": attempt,
-            }
-        )
+        await asyncio.sleep(max(0.0, deadline - loop.time()))
 
-    return poll_until_done
+    return json_utils.dumps(
+        {
+            "success": False,
+            "error": f"max_polls ({max_polls}) exceeded. Last {done_field} value: {current} (expected: {done_value})",
+            "attempts": attempt,
+        }
+    )
 
 
 @function_tool
@@ -489,14 +566,16 @@ def sql_query(sql: str, return_directly: bool = False) -> str:
     try:
         data = _query_results.get()
     except LookupError:
-        return json.dumps({"success": False, "error": "No data. Call rest_call first."})
+        return json_utils.dumps({"success": False, "error": "No data. Call rest_call first."})
 
     if not data:
-        return json.dumps({"success": False, "error": "No data. Call rest_call first."})
+        return json_utils.dumps({"success": False, "error": "No data. Call rest_call first."})
 
-    result = execute_sql(data, sql)
+    session = safe_get_contextvar(_sql_session, None)
+    result = session.execute(data, sql) if session else execute_sql(data, sql)
 
-    _log(f"SQL {json.dumps(result)[:200]}")
+    if settings.DEBUG:
+        _log(f"SQL {json_utils.preview(result)}")
 
     # Store full result for final response + apply char truncation for LLM
     if result.get("success"):
@@ -513,12 +592,9 @@ def sql_query(sql: str, return_directly: bool = False) -> str:
             _set_return_directly()
 
         if isinstance(rows, list):
-            return json.dumps(
-                {"success": True, **truncate_for_context(rows, "sql_result")},
-                indent=2,
-            )
+            return json_utils.dumps({"success": True, **truncate_for_context(rows, "sql_result")})
 
-    return json.dumps(result, indent=2)
+    return json_utils.dumps(result)
 
 
 def _create_individual_recipe_tools(
@@ -551,7 +627,7 @@ def _create_individual_recipe_tools(
                     return error
 
                 recipe, validated_params, error = validate_and_prepare_recipe(
-                    rid, json.dumps(kwargs), _raw_schema
+                    rid, json_utils.dumps(kwargs), _raw_schema
                 )
                 if error:
                     return error
@@ -561,9 +637,7 @@ def _create_individual_recipe_tools(
                         return (
                             False,
                             None,
-                            json.dumps(
-                                {"success": False, "error": "invalid recipe step"}, indent=2
-                            ),
+                            json_utils.dumps({"success": False, "error": "invalid recipe step"}),
                             None,
                         )
 
@@ -583,15 +657,14 @@ def _create_individual_recipe_tools(
                         bd if isinstance(bd, dict) and bd else None,
                         base_url=base_url,
                         headers=ctx.target_headers,
-                        allow_unsafe_paths=list(ctx.allow_unsafe_paths),
+                        allow_unsafe_paths=ctx.allow_unsafe_paths,
                     )
                     if not res.get("success"):
                         return (
                             False,
                             None,
-                            json.dumps(
-                                {"success": False, "error": res.get("error", "request failed")},
-                                indent=2,
+                            json_utils.dumps(
+                                {"success": False, "error": res.get("error", "request failed")}
                             ),
                             None,
                         )
@@ -599,19 +672,18 @@ def _create_individual_recipe_tools(
                     data = res.get("data", {})
                     tables, _ = extract_tables_from_response(data, name)
                     results.update(tables)
-                    _query_results.set(results)
-
-                    call_rec = {
-                        "method": method,
-                        "path": path,
-                        "path_params": json.dumps(pp) if pp else "",
-                        "query_params": json.dumps(qp) if qp else "",
-                        "body": json.dumps(bd) if bd else "",
-                        "name": name,
-                        "success": True,
-                    }
-                    safe_append_contextvar_list(_rest_calls, call_rec)
-                    return True, tables.get(name), "", call_rec
+
+                    call_rec = CallRecord(
+                        method=method,
+                        path=path,
+                        path_params=json_utils.dumps(pp) if pp else "",
+                        query_params=json_utils.dumps(qp) if qp else "",
+                        body=json_utils.dumps(bd) if bd else "",
+                        name=name,
+                        success=True,
+                    )
+                    ctx.state.api_calls.append(call_rec)
+                    return True, tables.get(name), "", call_rec.to_dict()
 
                 executed_calls: list[dict[str, Any]] = []
                 success, last_data, executed_sql, error = await execute_recipe_steps(
@@ -649,7 +721,7 @@ def _create_individual_recipe_tools(
 
 
 # Create search_schema tool bound to REST schema context var
-search_schema = create_search_schema_tool(_raw_schema)
+search_schema = create_search_schema_tool(_schema_index)
 
 
 async def process_rest_query(question: str, ctx: RequestContext) -> dict[str, Any]:
@@ -659,16 +731,18 @@ async def process_rest_query(question: str, ctx: RequestContext) -> dict[str, An
         question: Natural language question
         ctx: Request context with target_url (OpenAPI spec) and target_headers
     """
+    sql_session: SQLSession | None = None
     try:
         _log(f"QUERY {question[:80]}")
 
         # Reset per-request storage
-        _rest_calls.set([])
         _recipe_steps.set([])
         _sql_steps.set([])
         _query_results.set({})
         _last_result.set([None])  # Mutable list: [result_value]
         _return_directly_flag.set([])  # Reset direct return flag
+        sql_session = SQLSession()
+        _sql_session.set(sql_session)
         reset_progress()  # Reset turn counter
 
         # Fetch schema context (target_url = OpenAPI spec URL)
@@ -676,8 +750,9 @@ async def process_rest_query(question: str, ctx: RequestContext) -> dict[str, An
             ctx.target_url, ctx.target_headers
         )
 
-        # Store raw OpenAPI spec for search_schema tool
+        # Store raw OpenAPI spec for recipes and search_schema (indexed on first search)
         _raw_schema.set(raw_spec_json)
+        _schema_index.set(SchemaIndex(raw_spec_json))
 
         # Use header override or spec-derived base URL
         base_url = ctx.base_url or spec_base_url
@@ -700,15 +775,13 @@ async def process_rest_query(question: str, ctx: RequestContext) -> dict[str, An
             elif raw_schema:
                 _log(f"PRE-FLIGHT no matches for api_id={api_id[:50]}")
 
-        # Create tools with bound context
-        rest_tool = _create_rest_call_tool(ctx, base_url)
+        # Shared tools read this request's ctx/base_url from _rest_target
+        _rest_target.set((ctx, base_url))
 
         # Only include poll tool if user specified poll_paths header
-        include_polling = bool(ctx.poll_paths)
-        tools = [rest_tool, sql_query, search_schema]
-        if include_polling:
-            poll_tool = _create_poll_tool(ctx, base_url)
-            tools.insert(1, poll_tool)
+        tools = [rest_call, sql_query, search_schema]
+        if ctx.poll_paths:
+            tools.insert(1, poll_until_done)
         if suggestions:  # Create individual recipe tools for each suggestion
             recipe_tools = _create_individual_recipe_tools(ctx, base_url, suggestions)
             tools = [*recipe_tools, *tools]
@@ -740,13 +813,13 @@ async def process_rest_query(question: str, ctx: RequestContext) -> dict[str, An
                     run_config=get_run_config(),
                 )
 
-            api_calls = _rest_calls.get()
+            api_calls = [c.to_dict() for c in ctx.state.api_calls]
             last_data = _last_result.get()[0]
             turn_info = get_turn_context(settings.MAX_AGENT_TURNS)
 
         except MaxTurnsExceeded:
             # Return partial results when turn limit exceeded
-            api_calls = _rest_calls.get()
+            api_calls = [c.to_dict() for c in ctx.state.api_calls]
             last_data = _last_result.get()[0]
             turn_info = get_turn_context(settings.MAX_AGENT_TURNS)
             return build_partial_result(last_data, api_calls, turn_info, "api_calls")
@@ -786,7 +859,7 @@ async def process_rest_query(question: str, ctx: RequestContext) -> dict[str, An
             _log(f"DONE calls={len(api_calls)} output={agent_output[:100]}")
 
         # Skip polling recipes (v1)
-        skip_polling = any("poll_attempt" in c for c in safe_get_contextvar(_rest_calls, []))
+        skip_polling = any(c.poll_attempt is not None for c in ctx.state.api_calls)
         await maybe_extract_and_save_recipe(
             api_type="rest",
             api_id=build_api_id(ctx, "rest", base_url),
@@ -813,3 +886,6 @@ async def process_rest_query(question: str, ctx: RequestContext) -> dict[str, An
             "api_calls": [],
             "error": str(e),
         }
+    finally:
+        if sql_session is not None:
+            sql_session.close()
@@ -1,19 +1,120 @@
 """Shared schema search implementation for GraphQL and REST agents."""
 
+import functools
 import re
+from bisect import bisect_right
 from contextvars import ContextVar
 from typing import Callable
 
 from agents import function_tool
 
 from ..config import settings
+from ..json_utils import LazyDump
 
+_REGEX_META = frozenset(b".^$*+?{}[]\\|()\n")
 
-def create_search_schema_tool(raw_schema_var: ContextVar[str]):
+
+def _line_offsets(data: bytes | str) -> tuple[int, ...]:
+    """Offset of each line start (bytes or chars, matching data's type)."""
+    nl = b"\n" if isinstance(data, bytes) else "\n"
+    offsets = [0]
+    pos = data.find(nl)
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = data.find(nl, pos + 1)
+    return tuple(offsets)
+
+
+class SchemaIndex:
+    """Raw schema JSON plus the line index search_schema needs, built on first search.
+
+    Agents keep one per request next to the raw schema, so paginated searches index
+    once and nothing outlives the request.
+    """
+
+    def __init__(self, source: str | bytes | LazyDump):
+        self.source = source
+
+    @functools.cached_property
+    def data(self) -> bytes:
+        source = self.source
+        if isinstance(source, LazyDump):
+            source = source()  # Serialized on first search, then memoized
+        return source.encode("utf-8") if isinstance(source, str) else source
+
+    @functools.cached_property
+    def offsets(self) -> tuple[int, ...]:
+        return _line_offsets(self.data)
+
+    @functools.cached_property
+    def lowered(self) -> bytes:
+        """ASCII-lowercased schema (matches re.IGNORECASE on bytes)."""
+        return self.data.lower()
+
+    @functools.cached_property
+    def is_ascii(self) -> bool:
+        return self.data.isascii()
+
+    @functools.cached_property
+    def text(self) -> str:
+        """Decoded schema, for regexes that must see whole characters."""
+        return self.source if isinstance(self.source, str) else self.data.decode("utf-8", "replace")
+
+    @functools.cached_property
+    def text_offsets(self) -> tuple[int, ...]:
+        return _line_offsets(self.text)
+
+
+SchemaVar = ContextVar[str] | ContextVar[bytes] | ContextVar[LazyDump] | ContextVar[SchemaIndex]
+
+
+def _line_end(data: bytes | str, offsets: tuple[int, ...], idx: int) -> int:
+    """Offset just past line `idx` content (its newline, or end of data)."""
+    return offsets[idx + 1] - 1 if idx + 1 < len(offsets) else len(data)
+
+
+def _matching_lines(
+    regex: re.Pattern[bytes] | re.Pattern[str], data: bytes | str, offsets: tuple[int, ...]
+) -> list[int]:
+    """Indices of lines containing a match, scanning the whole buffer (no split)."""
+    matched: list[int] = []
+    pos = 0
+    while pos <= len(data):
+        m = regex.search(data, pos)
+        if not m:
+            break
+        idx = bisect_right(offsets, m.start()) - 1
+        end = _line_end(data, offsets, idx)
+        # A match spanning a newline doesn't count; re-check within the line only
+        if m.end() <= end or regex.search(data, offsets[idx], end):
+            matched.append(idx)
+        pos = end + 1
+    return matched
+
+
+def _matching_lines_literal(needle: bytes, data: bytes, offsets: tuple[int, ...]) -> list[int]:
+    """Like _matching_lines for a plain (already lowercased) substring on lowercased data.
+
+    bytes.find is a linear scan, several times faster than a case-insensitive regex.
+    """
+    matched: list[int] = []
+    pos = 0
+    while pos <= len(data):
+        start = data.find(needle, pos)
+        if start == -1:
+            break
+        idx = bisect_right(offsets, start) - 1
+        matched.append(idx)
+        pos = _line_end(data, offsets, idx) + 1
+    return matched
+
+
+def create_search_schema_tool(raw_schema_var: SchemaVar):
     """Create a search_schema function_tool bound to a specific context var.
 
     Args:
-        raw_schema_var: ContextVar holding the raw schema JSON string
+        raw_schema_var: ContextVar holding a SchemaIndex, or raw schema JSON (str, UTF-8
+            bytes, or LazyDump) that is then indexed on every call
 
     Returns:
         A FunctionTool for search_schema
@@ -48,13 +149,12 @@ def create_search_schema_tool(raw_schema_var: ContextVar[str]):
     return search_schema
 
 
-def create_search_schema_impl(
-    raw_schema_var: ContextVar[str],
-) -> Callable[..., str]:
+def create_search_schema_impl(raw_schema_var: SchemaVar) -> Callable[..., str]:
     """Create a search_schema_impl function bound to a specific context var.
 
     Args:
-        raw_schema_var: ContextVar holding the raw schema JSON string
+        raw_schema_var: ContextVar holding a SchemaIndex, or raw schema JSON (str, UTF-8
+            bytes, or LazyDump) that is then indexed on every call
 
     Returns:
         A search implementation function
@@ -70,6 +170,9 @@ def create_search_schema_impl(
     ) -> str:
         """Grep-like search on raw schema JSON.
 
+        Matching runs on UTF-8 bytes (only lines that are output get decoded), except
+        for non-ASCII patterns and regexes over non-ASCII schemas, which run on str.
+
         Args:
             pattern: Regex pattern (case-insensitive)
             before: Lines before match (-B)
@@ -82,10 +185,13 @@ def create_search_schema_impl(
             Grep-like output: "line_num:content" or "line_num-context" for context
         """
         try:
-            schema = raw_schema_var.get()
+            index = raw_schema_var.get()
         except LookupError:
             return "error: schema not loaded"
 
+        if not isinstance(index, SchemaIndex):
+            index = SchemaIndex(index)
+        schema = index.data
         if not schema:
             return "error: schema empty"
 
@@ -96,13 +202,32 @@ def create_search_schema_impl(
         if char_limit <= 0:
             return "error: max_chars must be > 0"
 
-        try:
-            regex = re.compile(pattern, re.IGNORECASE)
-        except re.error as e:
-            return f"error: invalid regex - {e}"
-
-        lines = schema.split("\n")
-        matched_indices = [idx for idx, line in enumerate(lines) if regex.search(line)]
+        needle = pattern.encode("utf-8")
+        plain = _REGEX_META.isdisjoint(needle)
+        # MULTILINE keeps ^/$ anchored per line, as when lines were searched one by one
+        flags = re.IGNORECASE | re.MULTILINE
+        if pattern.isascii() and (plain or index.is_ascii):
+            # Bytes are exact here: ASCII-only folding suffices, and neither a plain ASCII
+            # word nor a regex over an ASCII schema can split a UTF-8 character
+            schema, offsets = index.data, index.offsets
+            if plain:
+                # Plain word (the common case): substring scan instead of the regex engine
+                matched_indices = _matching_lines_literal(needle.lower(), index.lowered, offsets)
+            else:
+                try:
+                    regex = re.compile(needle, flags)
+                except re.error as e:
+                    return f"error: invalid regex - {e}"
+                matched_indices = _matching_lines(regex, schema, offsets)
+        else:
+            # Non-ASCII pattern, or a regex over a non-ASCII schema: match on str so
+            # case folding and ./\w cover whole characters
+            schema, offsets = index.text, index.text_offsets
+            try:
+                regex = re.compile(pattern, flags)
+            except re.error as e:
+                return f"error: invalid regex - {e}"
+            matched_indices = _matching_lines(regex, schema, offsets)
 
         if not matched_indices:
             return "(no matches)"
@@ -119,17 +244,24 @@ def create_search_schema_impl(
         b = before if before > 0 else context
         a = after if after > 0 else context
 
-        # Build blocks for all matches after offset
+        # Build blocks for matches after offset, stopping once past the char budget
         blocks: list[str] = []
+        used = 0
         for i in matched_indices[offset:]:
             start = max(0, i - b)
-            end = min(len(lines), i + a + 1)
+            end = min(len(offsets), i + a + 1)
             block_lines: list[str] = []
             for j in range(start, end):
                 ln = j + 1  # 1-indexed
                 sep = ":" if j == i else "-"
-                block_lines.append(f"{ln}{sep}{lines[j]}")
+                text = schema[offsets[j] : _line_end(schema, offsets, j)]
+                if isinstance(text, bytes):
+                    text = text.decode("utf-8", "replace")
+                block_lines.append(f"{ln}{sep}{text}")
             blocks.append("\n".join(block_lines))
+            used += len(blocks[-1])
+            if used > char_limit:
+                break
 
         def assemble(selected: list[str]) -> str:
             shown = len(selected)
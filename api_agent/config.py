@@ -40,9 +40,14 @@ class Settings(BaseSettings):
     MAX_PREVIEW_ROWS: int = 10  # Rows to show before suggesting pagination
     MAX_TOOL_RESPONSE_CHARS: int = 32000  # ~8K tokens, cap tool responses for LLM context
 
+    # Schema cache (per endpoint + headers)
+    SCHEMA_CACHE_TTL_SECONDS: int = 300  # 0 = disabled
+    SCHEMA_CACHE_SIZE: int = 32  # Max cached schemas (LRU eviction)
+
     # Polling limits
     MAX_POLLS: int = 20  # Max poll attempts
-    DEFAULT_POLL_DELAY_MS: int = 3000  # Default delay if agent doesn't specify
+    DEFAULT_POLL_DELAY_MS: int = 3000  # Initial delay if agent doesn't specify one
+    MAX_POLL_DELAY_MS: int = 15000  # Cap for default pacing (grows 1.5x per attempt)
 
     # Server
     DEBUG: bool = False
@@ -2,7 +2,8 @@
 
 import json
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any
 from urllib.parse import urlparse
 
 from fastmcp.server.dependencies import get_http_headers
@@ -14,6 +15,45 @@ class MissingHeaderError(Exception):
     pass
 
 
+@dataclass(slots=True)
+class CallRecord:
+    """One tracked REST call (params/body as compact JSON strings, "" if absent)."""
+
+    method: str
+    path: str
+    path_params: str
+    query_params: str
+    body: str
+    name: str
+    success: bool
+    poll_attempt: int | None = None  # Set for poll_until_done iterations
+
+    def to_dict(self) -> dict[str, Any]:
+        """Response form: poll_attempt only present for poll iterations."""
+        d: dict[str, Any] = {
+            "method": self.method,
+            "path": self.path,
+            "path_params": self.path_params,
+            "query_params": self.query_params,
+            "body": self.body,
+            "name": self.name,
+        }
+        if self.poll_attempt is not None:
+            d["poll_attempt"] = self.poll_attempt
+        d["success"] = self.success
+        return d
+
+
+@dataclass
+class AgentState:
+    """Mutable per-request agent state, read directly by request-bound tools."""
+
+    queries: list[str] = field(default_factory=list)  # Executed API queries, in order
+    api_calls: list[CallRecord] = field(default_factory=list)  # REST call log, in order
+    results: dict[str, Any] = field(default_factory=dict)  # Stored tables for sql_query
+    last_result: list[Any] = field(default_factory=lambda: [None])  # Mutable: [result_value]
+
+
 @dataclass(frozen=True)
 class RequestContext:
     """Per-request context extracted from headers."""
@@ -25,6 +65,7 @@ class RequestContext:
     base_url: str | None  # X-Base-URL: override base URL (REST only)
     include_result: bool  # X-Include-Result: whether to include full result in output
     poll_paths: tuple[str, ...]  # X-Poll-Paths: paths that require polling (enables poll tool)
+    state: AgentState = field(default_factory=AgentState, compare=False, repr=False)
 
 
 def get_request_context() -> RequestContext:
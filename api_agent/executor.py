@@ -1,17 +1,34 @@
 """Executor for GraphQL queries and DuckDB SQL processing."""
 
-import json
 import logging
 import os
 import tempfile
+import threading
 from typing import Any
 
 import duckdb
 
+from . import json_utils
 from .graphql import execute_query as graphql_execute
 
 logger = logging.getLogger(__name__)
 
+# Max rows fed to DuckDB type inference for schema hints (strided across the table)
+_SCHEMA_SAMPLE_ROWS = 1000
+
+# Shared in-memory DB for schema inference; each call takes its own cursor. Opening a
+# database costs ~10ms, far more than DESCRIBE itself. Nothing is ever created in it.
+_schema_db: duckdb.DuckDBPyConnection | None = None
+_schema_db_lock = threading.Lock()
+
+
+def _schema_cursor() -> duckdb.DuckDBPyConnection:
+    global _schema_db
+    with _schema_db_lock:
+        if _schema_db is None:
+            _schema_db = duckdb.connect()
+        return _schema_db.cursor()
+
 
 def extract_tables_from_response(
     data: Any, name: str
@@ -52,21 +69,24 @@ def extract_tables_from_response(
 def _extract_schema(data: list[dict], table_name: str) -> dict[str, Any]:
     """Extract DuckDB schema from data (internal helper).
 
-    Creates one temp file to get schema info for wrapped dicts.
+    Infers types with DESCRIBE over the JSON scan, without materializing a table.
+    Large tables are sampled (every k-th row, so late-appearing fields still show up);
+    rows is always the full count.
     """
     if not data:
         return {"rows": 0, "schema": "", "hint": "Empty table"}
 
+    sample = data
+    if len(data) > _SCHEMA_SAMPLE_ROWS:
+        sample = data[:: -(-len(data) // _SCHEMA_SAMPLE_ROWS)]  # ceil stride
+
     temp_file = None
     try:
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(data, f)
-            temp_file = f.name
-
-        conn = duckdb.connect()
-        conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM read_json_auto('{temp_file}')")
-        schema = conn.execute(f"DESCRIBE {table_name}").fetchall()
-        conn.close()
+        temp_file = _write_temp_json(sample)
+        with _schema_cursor() as conn:
+            schema = conn.execute(
+                f"DESCRIBE SELECT * FROM read_json_auto('{temp_file}', format='array')"
+            ).fetchall()
 
         schema_str = ", ".join([f"{col[0]}: {col[1]}" for col in schema])
 
@@ -79,11 +99,7 @@ def _extract_schema(data: list[dict], table_name: str) -> dict[str, Any]:
         logger.exception("Schema extraction error")
         return {"rows": len(data), "schema": "unknown", "hint": str(e)}
     finally:
-        if temp_file:
-            try:
-                os.unlink(temp_file)
-            except OSError:
-                pass
+        _remove_temp_file(temp_file)
 
 
 def truncate_for_context(
@@ -104,20 +120,18 @@ def truncate_for_context(
     max_chars = max_chars or settings.MAX_TOOL_RESPONSE_CHARS
     total_rows = len(data)
 
-    # Check if full data fits
-    if len(json.dumps(data)) <= max_chars:
-        return {"table": table_name, "rows": total_rows, "data": data, "truncated": False}
-
-    # Find how many complete rows fit
+    # Single pass over compact orjson sizes (the encoding tool responses are sent in),
+    # stopping at the first overflow so large responses are never serialized in full
     preview: list[dict] = []
     current_size = 2  # "[]"
     for row in data:
-        row_json = json.dumps(row)
-        new_size = current_size + len(row_json) + (1 if preview else 0)
+        new_size = current_size + len(json_utils.dumps_bytes(row)) + (1 if preview else 0)
         if new_size > max_chars:
             break
         preview.append(row)
         current_size = new_size
+    else:
+        return {"table": table_name, "rows": total_rows, "data": data, "truncated": False}
 
     schema = _extract_schema(data, table_name)
     return {
@@ -137,6 +151,134 @@ def get_table_schema_summary(data: list[dict], table_name: str) -> dict[str, Any
     return _extract_schema(data, table_name)
 
 
+def _write_temp_json(rows: list) -> str:
+    """Write rows as a JSON array to a temp file; caller removes it."""
+    with tempfile.NamedTemporaryFile(mode="wb", suffix=".json", delete=False) as f:
+        f.write(json_utils.dumps_bytes(rows))
+        return f.name
+
+
+def _remove_temp_file(path: str | None) -> None:
+    if path:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _load_table(conn: duckdb.DuckDBPyConnection, name: str, rows: list) -> None:
+    """(Re)create table `name` from JSON rows via a temp file (DuckDB infers types).
+
+    format='array' skips DuckDB's JSON format detection; rows are always written as one array.
+    """
+    temp_file = None
+    try:
+        temp_file = _write_temp_json(rows)
+        conn.execute(
+            f"CREATE OR REPLACE TABLE {name} AS "
+            f"SELECT * FROM read_json_auto('{temp_file}', format='array')"
+        )
+    finally:
+        _remove_temp_file(temp_file)
+
+
+# Statement types a ROLLBACK fully undoes. Anything else (transaction control, SET,
+# ATTACH, ...) can outlive the query, so the session is reset after running it.
+_ROLLBACK_SAFE = frozenset(
+    {
+        duckdb.StatementType.SELECT,
+        duckdb.StatementType.INSERT,
+        duckdb.StatementType.UPDATE,
+        duckdb.StatementType.DELETE,
+        duckdb.StatementType.CREATE,
+        duckdb.StatementType.DROP,
+        duckdb.StatementType.ALTER,
+        duckdb.StatementType.EXPLAIN,
+    }
+)
+
+
+def _is_rollback_safe(conn: duckdb.DuckDBPyConnection, query: str) -> bool:
+    try:
+        statements = conn.extract_statements(query)
+    except duckdb.Error:
+        return True  # Unparseable: execute() raises the real error and nothing runs
+    return all(s.type in _ROLLBACK_SAFE for s in statements)
+
+
+class SQLSession:
+    """DuckDB connection reused across SQL calls within one request.
+
+    Each table is loaded once and only reloaded when its data object is replaced,
+    so repeated sql_query calls skip re-serializing and re-parsing every table.
+    Queries run inside a transaction that is always rolled back, so each call sees
+    only the loaded tables (as a fresh database would), never an earlier call's DDL/DML.
+    """
+
+    def __init__(self) -> None:
+        self._conn: duckdb.DuckDBPyConnection | None = None
+        self._loaded: dict[str, Any] = {}  # table name -> data object it was loaded from
+        self._lock = threading.Lock()
+
+    def _sync_tables(self, conn: duckdb.DuckDBPyConnection, data: Any) -> None:
+        """Load new/replaced tables; drop ones whose data is gone or empty."""
+        tables = data if isinstance(data, dict) else {"data": data}
+        for key, value in tables.items():
+            if isinstance(value, list) and value:
+                if self._loaded.get(key) is not value:
+                    _load_table(conn, key, value)
+                    self._loaded[key] = value
+            elif self._loaded.pop(key, None) is not None:
+                conn.execute(f"DROP TABLE IF EXISTS {key}")
+
+    def _end_query(self, conn: duckdb.DuckDBPyConnection, isolated: bool) -> None:
+        """Undo the query's effects; reset if the rollback can't guarantee that."""
+        try:
+            conn.execute("ROLLBACK")
+        except duckdb.Error:
+            isolated = False  # Query ended our transaction itself (COMMIT/ROLLBACK)
+        if not isolated:
+            self._reset()
+
+    def _reset(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._loaded.clear()
+
+    def execute(self, data: Any, query: str) -> dict[str, Any]:
+        """Execute SQL query on JSON data. Same contract as execute_sql."""
+        with self._lock:
+            try:
+                if self._conn is None:
+                    self._conn = duckdb.connect()
+                conn = self._conn
+                self._sync_tables(conn, data)
+
+                isolated = _is_rollback_safe(conn, query)
+                conn.execute("BEGIN TRANSACTION")
+                try:
+                    result = conn.execute(query).fetchall()
+                    columns = [desc[0] for desc in conn.description or []]
+                finally:
+                    self._end_query(conn, isolated)
+
+                # Convert to list of dicts
+                rows = [dict(zip(columns, row)) for row in result]
+                return {"success": True, "result": rows}
+
+            except duckdb.Error as e:
+                return {"success": False, "error": f"SQL error: {e}"}
+            except Exception as e:
+                logger.exception("SQL execution error")
+                return {"success": False, "error": str(e)}
+
+    def close(self) -> None:
+        """Close the underlying connection (tables are dropped with it)."""
+        with self._lock:
+            self._reset()
+
+
 def execute_sql(data: Any, query: str) -> dict[str, Any]:
     """Execute SQL query on JSON data using DuckDB.
 
@@ -147,47 +289,11 @@ def execute_sql(data: Any, query: str) -> dict[str, Any]:
     Returns:
         Dict with success/result or error
     """
-    temp_files = []
+    session = SQLSession()
     try:
-        conn = duckdb.connect()
-
-        # Register top-level keys as tables via temp JSON files
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if isinstance(value, list) and value:
-                    # Write to temp file for DuckDB to read
-                    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-                        json.dump(value, f)
-                        temp_files.append(f.name)
-                    conn.execute(f"CREATE TABLE {key} AS SELECT * FROM read_json_auto('{f.name}')")
-        elif isinstance(data, list):
-            with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-                json.dump(data, f)
-                temp_files.append(f.name)
-            conn.execute(f"CREATE TABLE data AS SELECT * FROM read_json_auto('{f.name}')")
-
-        # Execute query
-        result = conn.execute(query).fetchall()
-        columns = [desc[0] for desc in conn.description or []]
-
-        # Convert to list of dicts
-        rows = [dict(zip(columns, row)) for row in result]
-
-        conn.close()
-        return {"success": True, "result": rows}
-
-    except duckdb.Error as e:
-        return {"success": False, "error": f"SQL error: {e}"}
-    except Exception as e:
-        logger.exception("SQL execution error")
-        return {"success": False, "error": str(e)}
+        return session.execute(data, query)
     finally:
-        # Cleanup temp files
-        for temp_file in temp_files:
-            try:
-                os.unlink(temp_file)
-            except OSError:
-                pass
+        session.close()
 
 
 async def execute_graphql(
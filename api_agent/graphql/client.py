@@ -1,16 +1,49 @@
 """GraphQL client."""
 
+import asyncio
 import logging
 import re
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from typing import Any
 
 import httpx
 
+from ..http_utils import close_stale_client, parse_json
+
 logger = logging.getLogger(__name__)
 
 # Block mutations (read-only mode)
 _MUTATION_PATTERN = re.compile(r"^\s*mutation\b", re.IGNORECASE | re.MULTILINE)
 
+# Shared keep-alive client: schema introspection and every tool call to the same
+# endpoint reuse pooled TCP/TLS connections instead of handshaking per request
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get the shared client, recreating it if the event loop changed (clients are loop-bound)."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        close_stale_client(_client, _client_loop)
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=50),
+            # Never persist Set-Cookie: the client is shared across requests/callers
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def aclose_client() -> None:
+    """Close the shared client (server shutdown). The next request creates a new one."""
+    global _client, _client_loop
+    client, _client, _client_loop = _client, None, None
+    if client is not None:
+        await client.aclose()
+
 
 async def execute_query(
     query: str,
@@ -44,20 +77,19 @@ async def execute_query(
     if variables:
         payload["variables"] = variables
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            resp = await client.post(
-                endpoint,
-                json=payload,
-                headers=request_headers,
-            )
-            resp.raise_for_status()
-            result = resp.json()
-            if "errors" in result:
-                return {"success": False, "error": result["errors"]}
-            return {"success": True, "data": result.get("data", {})}
-        except httpx.HTTPStatusError as e:
-            return {"success": False, "error": f"HTTP {e.response.status_code}"}
-        except Exception as e:
-            logger.exception("GraphQL error")
-            return {"success": False, "error": str(e)}
+    try:
+        resp = await _get_client().post(
+            endpoint,
+            json=payload,
+            headers=request_headers,
+        )
+        resp.raise_for_status()
+        result = parse_json(resp)
+        if "errors" in result:
+            return {"success": False, "error": result["errors"]}
+        return {"success": True, "data": result.get("data", {})}
+    except httpx.HTTPStatusError as e:
+        return {"success": False, "error": f"HTTP {e.response.status_code}"}
+    except Exception as e:
+        logger.exception("GraphQL error")
+        return {"success": False, "error": str(e)}
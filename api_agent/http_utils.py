@@ -0,0 +1,59 @@
+"""Helpers shared by the GraphQL and REST HTTP clients."""
+
+import asyncio
+import logging
+import re
+from typing import Any
+
+import httpx
+
+from . import json_utils
+
+logger = logging.getLogger(__name__)
+
+_closing: set[asyncio.Task] = set()  # Strong refs until background closes finish
+
+# 20+ digit runs: integers past uint64 that orjson would silently parse as floats
+_WIDE_INT = re.compile(rb"\d{20}")
+
+
+def parse_json(resp: httpx.Response) -> Any:
+    """Parse a JSON body straight from bytes with orjson.
+
+    Falls back to resp.json() for UTF-16/32 bodies, which orjson rejects, and for
+    bodies with 20+ digit numbers, so wide IDs/amounts stay exact ints.
+    """
+    content = resp.content
+    if _WIDE_INT.search(content):
+        return resp.json()
+    try:
+        return json_utils.loads(content)
+    except json_utils.JSONDecodeError:
+        return resp.json()
+
+
+async def _aclose_quietly(client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except Exception:
+        logger.debug("Failed to close stale HTTP client", exc_info=True)
+
+
+def close_stale_client(
+    client: httpx.AsyncClient | None, loop: asyncio.AbstractEventLoop | None
+) -> None:
+    """Best-effort close of a shared client replaced because the event loop changed.
+
+    Closes on the client's own loop if that is still running in another thread
+    (its connections are bound to it), else in the background on the current loop.
+    Never raises.
+    """
+    if client is None or client.is_closed:
+        return
+    current = asyncio.get_running_loop()
+    if loop is not None and loop is not current and loop.is_running():
+        asyncio.run_coroutine_threadsafe(_aclose_quietly(client), loop)
+        return
+    task = current.create_task(_aclose_quietly(client))
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
@@ -0,0 +1,82 @@
+"""Fast JSON serialization helpers (orjson-backed)."""
+
+import json
+import reprlib
+from typing import Any
+
+import orjson
+
+JSONDecodeError = orjson.JSONDecodeError  # Subclass of json.JSONDecodeError
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (no decode step).
+
+    Non-native values (e.g. Decimal from DuckDB) fall back to str(). Objects orjson
+    can't encode at all (ints beyond 64 bits, e.g. DuckDB HUGEINT) go through stdlib json.
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with 2-space indent (matches json.dumps(indent=2))
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(obj, default=str, option=option)
+    except orjson.JSONEncodeError:
+        if indent:
+            text = json.dumps(obj, default=str, ensure_ascii=False, indent=2)
+        else:
+            text = json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":"))
+        return text.encode()
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to JSON string. See dumps_bytes."""
+    return dumps_bytes(obj, indent).decode()
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON (bytes parsed directly, no decode step).
+
+    Raises:
+        orjson.JSONDecodeError: subclass of json.JSONDecodeError
+    """
+    return orjson.loads(data)
+
+
+class LazyDump:
+    """JSON bytes for an object, serialized on first call and memoized.
+
+    Lets callers hand out large payloads (e.g. raw schema) without paying for
+    serialization unless something actually reads them.
+    """
+
+    __slots__ = ("obj", "indent", "_data")
+
+    def __init__(self, obj: Any, indent: bool = False):
+        self.obj = obj
+        self.indent = indent
+        self._data: bytes | None = None
+
+    def __call__(self) -> bytes:
+        if self._data is None:
+            self._data = dumps_bytes(self.obj, self.indent)
+        return self._data
+
+
+_preview_repr = reprlib.Repr()
+_preview_repr.maxlevel = 3
+_preview_repr.maxdict = 8
+_preview_repr.maxlist = 5
+_preview_repr.maxstring = 80
+_preview_repr.maxother = 80
+
+
+def preview(obj: Any, limit: int = 200) -> str:
+    """Bounded repr of obj for debug logs.
+
+    Unlike dumps(obj)[:limit], cost is independent of payload size.
+    """
+    return _preview_repr.repr(obj)[:limit]
@@ -1,6 +1,5 @@
 """FastMCP middleware for dynamic tool naming per session."""
 
-import re
 from collections.abc import Sequence
 
 from fastmcp.server.dependencies import get_http_headers
@@ -10,21 +9,21 @@ from mcp import types as mt
 
 from .context import extract_api_name, get_full_hostname
 
-# Internal tool name suffix pattern
-INTERNAL_TOOL_PATTERN = re.compile(r"^_(.+)$")
-
 
 def _get_tool_suffix(internal_name: str) -> str:
     """Extract suffix from internal tool name (_query -> query)."""
-    match = INTERNAL_TOOL_PATTERN.match(internal_name)
-    return match.group(1) if match else internal_name
+    return internal_name.removeprefix("_") or internal_name  # Bare "_" stays as-is
+
+
+def _api_context_prefix(hostname: str, api_type: str) -> str:
+    """Description prefix naming the session's API (same for every tool in a listing)."""
+    api_type_label = "GraphQL" if api_type == "graphql" else "REST"
+    return f"[{hostname} {api_type_label} API] "
 
 
 def _inject_api_context(description: str, hostname: str, api_type: str) -> str:
     """Inject API context into tool description using full hostname."""
-    api_type_label = "GraphQL" if api_type == "graphql" else "REST"
-    prefix = f"[{hostname} {api_type_label} API] "
-    return prefix + description
+    return _api_context_prefix(hostname, api_type) + description
 
 
 class DynamicToolNamingMiddleware(Middleware):
@@ -49,13 +48,13 @@ class DynamicToolNamingMiddleware(Middleware):
 
         # Short prefix for tool name, full hostname for description
         name_prefix = extract_api_name(headers)
-        full_hostname = get_full_hostname(target_url)
+        desc_prefix = _api_context_prefix(get_full_hostname(target_url), api_type)
 
         transformed = []
         for tool in tools:
             suffix = _get_tool_suffix(tool.name)
             new_name = f"{name_prefix}_{suffix}"
-            new_desc = _inject_api_context(tool.description or "", full_hostname, api_type)
+            new_desc = desc_prefix + (tool.description or "")
 
             modified_tool = tool.model_copy(update={"name": new_name, "description": new_desc})
             transformed.append(modified_tool)
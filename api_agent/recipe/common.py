@@ -11,7 +11,8 @@ from agents.agent import ToolsToFinalOutputResult
 from pydantic import BaseModel, ConfigDict, Field, create_model
 
 from ..config import settings
-from ..executor import execute_sql, truncate_for_context
+from ..executor import SQLSession, truncate_for_context
+from ..json_utils import LazyDump
 from .extractor import extract_recipe
 from .store import RECIPE_STORE, params_with_defaults, render_text_template, sha256_hex
 
@@ -24,7 +25,7 @@ async def maybe_extract_and_save_recipe(
     question: str,
     steps: list,
     sql_steps: list[str],
-    raw_schema: str,
+    raw_schema: str | bytes,
     skip_condition: bool = False,
 ) -> None:
     """Extract and save recipe if conditions met.
@@ -35,7 +36,7 @@ async def maybe_extract_and_save_recipe(
         question: Original user question
         steps: API call steps from agent execution
         sql_steps: SQL steps from agent execution
-        raw_schema: Raw schema string for hash
+        raw_schema: Raw schema JSON (str or UTF-8 bytes) for hash
         skip_condition: If True, skip extraction (e.g., polling used)
     """
     if not settings.ENABLE_RECIPES:
@@ -146,28 +147,34 @@ def _execute_sql_steps(
     results: dict[str, Any],
     last_result_var: ContextVar[list[Any]],
 ) -> tuple[bool, list[str], str]:
-    """Execute SQL steps. Returns (success, executed_sql, error_json)."""
-    executed_sql: list[str] = []
+    """Execute SQL steps. Returns (success, executed_sql, error_json).
 
-    for sql_tmpl in sql_steps:
-        if not isinstance(sql_tmpl, str):
-            return (
-                False,
-                executed_sql,
-                json.dumps({"success": False, "error": "invalid sql_steps"}, indent=2),
-            )
+    Steps share one DuckDB connection, so each table is loaded once, not once per step.
+    """
+    executed_sql: list[str] = []
+    session = SQLSession()
+    try:
+        for sql_tmpl in sql_steps:
+            if not isinstance(sql_tmpl, str):
+                return (
+                    False,
+                    executed_sql,
+                    json.dumps({"success": False, "error": "invalid sql_steps"}, indent=2),
+                )
 
-        sql = render_text_template(sql_tmpl, params)
-        res = execute_sql(results, sql)
-        executed_sql.append(sql)
+            sql = render_text_template(sql_tmpl, params)
+            res = session.execute(results, sql)
+            executed_sql.append(sql)
 
-        if not res.get("success"):
-            return False, executed_sql, json.dumps(res, indent=2)
+            if not res.get("success"):
+                return False, executed_sql, json.dumps(res, indent=2)
 
-        try:
-            last_result_var.get()[0] = res.get("result", [])
-        except LookupError:
-            pass
+            try:
+                last_result_var.get()[0] = res.get("result", [])
+            except LookupError:
+                pass
+    finally:
+        session.close()
 
     return True, executed_sql, ""
 
@@ -252,7 +259,7 @@ def _steps_summary(steps: list, sql_steps: list) -> str:
 
 def search_recipes(
     api_id: str,
-    raw_schema: str,
+    raw_schema: str | bytes,
     question: str,
     k: int = 3,
 ) -> tuple[list[dict[str, Any]], str]:
@@ -260,7 +267,7 @@ def search_recipes(
 
     Args:
         api_id: API identifier (e.g., "graphql:url" or "rest:url|base")
-        raw_schema: Raw schema JSON string
+        raw_schema: Raw schema JSON (str or UTF-8 bytes)
         question: User's question
         k: Max suggestions to return
 
@@ -335,7 +342,7 @@ def _error_json(msg: str) -> str:
 def validate_and_prepare_recipe(
     recipe_id: str,
     params_json: str,
-    raw_schema_var: ContextVar[str],
+    raw_schema_var: ContextVar[str] | ContextVar[bytes] | ContextVar[LazyDump],
 ) -> tuple[dict[str, Any] | None, dict[str, Any] | None, str]:
     """Validate recipe and prepare params. Returns (recipe, params, error_json)."""
     try:
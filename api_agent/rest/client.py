@@ -1,24 +1,73 @@
 """REST API client with unsafe method blocking."""
 
+import asyncio
 import fnmatch
+import functools
 import logging
+import re
+from collections.abc import Collection
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from typing import Any
-from urllib.parse import urlencode, urljoin
+from urllib.parse import urlencode
 
 import httpx
 
+from .. import json_utils
+from ..http_utils import close_stale_client, parse_json
+
 logger = logging.getLogger(__name__)
 
 # Unsafe HTTP methods (blocked by default)
 _UNSAFE_METHODS = {"POST", "PUT", "DELETE", "PATCH"}
-
-
-def _is_path_allowed(path: str, patterns: list[str]) -> bool:
+_SUPPORTED_METHODS = _UNSAFE_METHODS | {"GET"}
+_BLOCKED_ERRORS = {
+    m: f"{m} method not allowed (read-only mode). Use X-Allow-Unsafe-Paths header."
+    for m in _UNSAFE_METHODS
+}
+
+# Shared keep-alive client: rest_call and every poll_until_done iteration reuse
+# pooled TCP/TLS connections instead of handshaking per request
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get the shared client, recreating it if the event loop changed (clients are loop-bound)."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        close_stale_client(_client, _client_loop)
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            # Only idle connections are capped: a shared total limit would make concurrent
+            # callers (e.g. parallel poll loops) queue on the pool timeout
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=None),
+            # Never persist Set-Cookie: the client is shared across requests/callers
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def aclose_client() -> None:
+    """Close the shared client (server shutdown). The next request creates a new one."""
+    global _client, _client_loop
+    client, _client, _client_loop = _client, None, None
+    if client is not None:
+        await client.aclose()
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_globs(patterns: tuple[str, ...]) -> re.Pattern[str]:
+    """Union of fnmatch globs as one regex (cached: the whitelist is fixed per caller)."""
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+
+def _is_path_allowed(path: str, patterns: Collection[str]) -> bool:
     """Check if path matches any allowed pattern (fnmatch glob)."""
-    for pattern in patterns:
-        if fnmatch.fnmatch(path, pattern):
-            return True
-    return False
+    if not patterns:
+        return False
+    return _compile_globs(tuple(patterns)).match(path) is not None
 
 
 def _build_url(
@@ -39,14 +88,16 @@ def _build_url(
         Full URL string
     """
     # Substitute path params
-    if path_params:
+    if path_params and "{" in path:
         for key, value in path_params.items():
             path = path.replace(f"{{{key}}}", str(value))
 
     if not base_url:
         raise ValueError("No base URL provided")
 
-    url = urljoin(base_url.rstrip("/") + "/", path.lstrip("/"))
+    # Plain concatenation: urljoin re-parses the result, reads "users:search" as a URL
+    # scheme, and lets an absolute-URL path replace the configured host
+    url = f"{base_url.rstrip('/')}/{path.lstrip('/')}"
 
     # Add query params
     if query_params:
@@ -67,7 +118,7 @@ async def execute_request(
     base_url: str = "",
     headers: dict[str, str] | None = None,
     allow_unsafe: bool = False,
-    allow_unsafe_paths: list[str] | None = None,
+    allow_unsafe_paths: Collection[str] | None = None,
 ) -> dict[str, Any]:
     """Execute REST API request. Unsafe methods blocked unless explicitly allowed.
 
@@ -91,10 +142,10 @@ async def execute_request(
     if method in _UNSAFE_METHODS and not allow_unsafe:
         # Check if path matches allowlist
         if not allow_unsafe_paths or not _is_path_allowed(path, allow_unsafe_paths):
-            return {
-                "success": False,
-                "error": f"{method} method not allowed (read-only mode). Use X-Allow-Unsafe-Paths header.",
-            }
+            return {"success": False, "error": _BLOCKED_ERRORS[method]}
+    # Reject before building the URL or headers
+    if method not in _SUPPORTED_METHODS:
+        return {"success": False, "error": f"Unsupported method: {method}"}
 
     try:
         url = _build_url(path, base_url, path_params, query_params)
@@ -105,39 +156,39 @@ async def execute_request(
     if headers:
         request_headers.update(headers)
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    client = _get_client()
+    try:
+        if method == "GET":
+            resp = await client.get(url, headers=request_headers)
+        elif method in {"POST", "PUT", "PATCH"}:
+            request_headers["Content-Type"] = "application/json"
+            # orjson-encoded (compact UTF-8, as httpx's json= would produce) for speed
+            content = json_utils.dumps_bytes(body) if body is not None else None
+            resp = await client.request(method, url, content=content, headers=request_headers)
+        else:  # DELETE
+            resp = await client.delete(url, headers=request_headers)
+
+        resp.raise_for_status()
+
+        # Handle different content types
+        content_type = resp.headers.get("content-type", "")
+        if "application/json" in content_type:
+            data = parse_json(resp)
+        else:
+            data = resp.text
+
+        return {"success": True, "data": data}
+
+    except httpx.HTTPStatusError as e:
+        # Try to get error body
         try:
-            if method == "GET":
-                resp = await client.get(url, headers=request_headers)
-            elif method in {"POST", "PUT", "PATCH"}:
-                request_headers["Content-Type"] = "application/json"
-                resp = await client.request(method, url, json=body, headers=request_headers)
-            elif method == "DELETE":
-                resp = await client.delete(url, headers=request_headers)
-            else:
-                return {"success": False, "error": f"Unsupported method: {method}"}
-
-            resp.raise_for_status()
-
-            # Handle different content types
-            content_type = resp.headers.get("content-type", "")
-            if "application/json" in content_type:
-                data = resp.json()
-            else:
-                data = resp.text
-
-            return {"success": True, "data": data}
-
-        except httpx.HTTPStatusError as e:
-            # Try to get error body
-            try:
-                error_body = e.response.json()
-            except Exception:
-                error_body = e.response.text[:500]
-            return {
-                "success": False,
-                "error": f"HTTP {e.response.status_code}: {error_body}",
-            }
-        except Exception as e:
-            logger.exception("REST API error")
-            return {"success": False, "error": str(e)}
+            error_body = e.response.json()
+        except Exception:
+            error_body = e.response.text[:500]
+        return {
+            "success": False,
+            "error": f"HTTP {e.response.status_code}: {error_body}",
+        }
+    except Exception as e:
+        logger.exception("REST API error")
+        return {"success": False, "error": str(e)}
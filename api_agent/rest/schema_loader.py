@@ -7,10 +7,22 @@ from typing import Any
 import httpx
 import yaml
 
+from .. import json_utils
 from ..config import settings
+from ..schema_cache import SchemaCache, schema_cache_key
 
 logger = logging.getLogger(__name__)
 
+# Process-wide spec cache: (spec_url, headers) -> (context, base_url, raw_spec_json)
+_schema_cache = SchemaCache()
+
+# JSON Schema scalar type -> compact notation (others pass through unchanged)
+_TYPE_MAP = {
+    "integer": "int",
+    "number": "float",
+    "boolean": "bool",
+}
+
 
 async def load_openapi_spec(
     spec_url: str,
@@ -80,9 +92,11 @@ def _infer_string_format(field_name: str) -> str:
     name_lower = field_name.lower()
     if "datetime" in name_lower:
         return "date-time"
-    if "date" in name_lower and "update" not in name_lower:
+    if "update" in name_lower:
+        return ""  # updateDate/lastUpdated: audit fields, not values to fill in
+    if "date" in name_lower:
         return "date"
-    if "time" in name_lower and "update" not in name_lower:
+    if "time" in name_lower:
         return "time"
     return ""
 
@@ -124,12 +138,7 @@ def _schema_to_type(
         fmt = schema.get("format", "") or _infer_string_format(field_name)
         return f"str({fmt})" if fmt else "str"
 
-    type_map = {
-        "integer": "int",
-        "number": "float",
-        "boolean": "bool",
-    }
-    return type_map.get(schema_type, schema_type)
+    return _TYPE_MAP.get(schema_type, schema_type)
 
 
 def _format_params(params: list[dict[str, Any]]) -> str:
@@ -268,25 +277,17 @@ def build_schema_context(spec: dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-async def fetch_schema_context(
+async def _load_schema_context(
     spec_url: str,
     headers: dict[str, str] | None = None,
 ) -> tuple[str, str, str]:
-    """Fetch and build schema context.
-
-    Args:
-        spec_url: URL to OpenAPI spec
-        headers: Optional auth headers
-
-    Returns:
-        Tuple of (truncated_context, base_url, raw_spec_json)
-    """
+    """Load spec and build (truncated_context, base_url, raw_spec_json), empty on failure."""
     spec = await load_openapi_spec(spec_url, headers)
     if not spec:
         return "", "", ""
 
     # Raw spec JSON for grep-like search (preserves all info)
-    raw_spec_json = json.dumps(spec, indent=2)
+    raw_spec_json = json_utils.dumps(spec, indent=True)
 
     # Build DSL for LLM context
     dsl_context = build_schema_context(spec)
@@ -301,3 +302,23 @@ async def fetch_schema_context(
         )
 
     return context, base_url, raw_spec_json
+
+
+async def fetch_schema_context(
+    spec_url: str,
+    headers: dict[str, str] | None = None,
+) -> tuple[str, str, str]:
+    """Fetch and build schema context, reusing cached results within TTL.
+
+    Args:
+        spec_url: URL to OpenAPI spec
+        headers: Optional auth headers
+
+    Returns:
+        Tuple of (truncated_context, base_url, raw_spec_json)
+    """
+    return await _schema_cache.get_or_load(
+        schema_cache_key(spec_url, headers),
+        lambda: _load_schema_context(spec_url, headers),
+        cacheable=lambda result: bool(result[2]),
+    )
@@ -0,0 +1,70 @@
+"""Process-wide TTL + LRU cache for fetched API schemas."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .config import settings
+
+
+def schema_cache_key(url: str, headers: dict[str, str] | None) -> tuple:
+    """Cache key for a schema URL + forwarded headers (auth may change visible schema)."""
+    return url, frozenset((headers or {}).items())
+
+
+class SchemaCache:
+    """Schemas keyed by (url, headers), reused within SCHEMA_CACHE_TTL_SECONDS.
+
+    Holds at most SCHEMA_CACHE_SIZE entries (least recently used evicted first).
+    A per-key lock makes concurrent requests for the same key share one fetch.
+    """
+
+    def __init__(self) -> None:
+        # key -> (value, fetched_at)
+        self._entries: OrderedDict[tuple, tuple[Any, float]] = OrderedDict()
+        self._locks: dict[tuple, asyncio.Lock] = {}  # Per-key locks dedupe concurrent fetches
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._locks.clear()
+
+    async def get_or_load(
+        self,
+        key: tuple,
+        loader: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool],
+    ) -> Any:
+        """Return the cached value for key, or await loader() and cache it.
+
+        Args:
+            key: Cache key (see schema_cache_key)
+            loader: Fetches a fresh value
+            cacheable: False for failed loads, which are returned but not cached
+        """
+        ttl = settings.SCHEMA_CACHE_TTL_SECONDS
+        if ttl <= 0:
+            return await loader()
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._entries.get(key)
+            if cached and time.monotonic() - cached[1] < ttl:
+                self._entries.move_to_end(key)
+                return cached[0]
+
+            value = await loader()
+            if cacheable(value):
+                self._entries[key] = (value, time.monotonic())
+                self._entries.move_to_end(key)
+                while len(self._entries) > settings.SCHEMA_CACHE_SIZE:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._locks.pop(evicted, None)
+            else:
+                self._entries.pop(key, None)
+                self._locks.pop(key, None)
+            return value
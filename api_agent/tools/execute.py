@@ -90,7 +90,7 @@ Use this to re-run queries from the query tool or execute known operations.""",
                 body,
                 base_url=base_url,
                 headers=ctx.target_headers,
-                allow_unsafe_paths=list(ctx.allow_unsafe_paths),
+                allow_unsafe_paths=ctx.allow_unsafe_paths,
             )
 
             if not result.get("success"):
@@ -11,8 +11,6 @@ import duckdb
 from fastmcp import FastMCP
 from pydantic import Field
 
-from ..agent.graphql_agent import process_query
-from ..agent.rest_agent import process_rest_query
 from ..context import MissingHeaderError, get_request_context
 
 
@@ -81,9 +79,14 @@ Returns answer and the queries/calls made (reusable with execute tool).""",
         except MissingHeaderError as e:
             return {"ok": False, "error": str(e)}
 
+        # Lazy: agent modules load the agents SDK/openai stack (slow cold start)
         if ctx.api_type == "graphql":
+            from ..agent.graphql_agent import process_query
+
             result = await process_query(question, ctx)
         else:
+            from ..agent.rest_agent import process_rest_query
+
             result = await process_rest_query(question, ctx)
 
         # Direct return: just CSV, no wrapper
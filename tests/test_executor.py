@@ -1,8 +1,8 @@
 """Tests for executor utilities."""
 
-import json
-
+from api_agent import json_utils
 from api_agent.executor import (
+    SQLSession,
     execute_sql,
     extract_tables_from_response,
     get_table_schema_summary,
@@ -157,6 +157,103 @@ class TestExecuteSql:
         assert "error" in result
 
 
+class TestSQLSession:
+    """Test SQLSession table reuse across calls."""
+
+    def test_tables_loaded_once(self):
+        """Unchanged tables are not reloaded on later queries."""
+        from unittest.mock import patch
+
+        from api_agent import executor
+
+        data = {"users": [{"id": 1}, {"id": 2}]}
+        session = SQLSession()
+        with patch.object(executor, "_load_table", wraps=executor._load_table) as spy:
+            first = session.execute(data, "SELECT COUNT(*) AS n FROM users")
+            second = session.execute(data, "SELECT MAX(id) AS m FROM users")
+        session.close()
+
+        assert first["result"] == [{"n": 2}]
+        assert second["result"] == [{"m": 2}]
+        assert spy.call_count == 1
+
+    def test_replaced_table_reloaded(self):
+        """Storing new data under the same name reloads that table."""
+        data = {"users": [{"id": 1}]}
+        session = SQLSession()
+        session.execute(data, "SELECT * FROM users")
+        data["users"] = [{"id": 1}, {"id": 2}, {"id": 3}]
+        result = session.execute(data, "SELECT COUNT(*) AS n FROM users")
+        session.close()
+
+        assert result["result"] == [{"n": 3}]
+
+    def test_emptied_table_dropped(self):
+        """Tables whose data became empty are dropped."""
+        data = {"users": [{"id": 1}]}
+        session = SQLSession()
+        session.execute(data, "SELECT * FROM users")
+        data["users"] = []
+        result = session.execute(data, "SELECT * FROM users")
+        session.close()
+
+        assert result["success"] is False
+
+    def test_create_table_not_kept_across_calls(self):
+        """A table created in one call doesn't exist in the next."""
+        data = {"users": [{"id": 1}]}
+        session = SQLSession()
+        first = session.execute(data, "CREATE TABLE t AS SELECT * FROM users; SELECT * FROM t")
+        second = session.execute(data, "CREATE TABLE t AS SELECT * FROM users; SELECT * FROM t")
+        session.close()
+
+        assert first == {"success": True, "result": [{"id": 1}]}
+        assert second == {"success": True, "result": [{"id": 1}]}
+
+    def test_dropped_table_restored(self):
+        """Dropping a loaded table doesn't leave it missing for later calls."""
+        data = {"users": [{"id": 1}, {"id": 2}]}
+        session = SQLSession()
+        dropped = session.execute(data, "DROP TABLE users")
+        result = session.execute(data, "SELECT COUNT(*) AS n FROM users")
+        session.close()
+
+        assert dropped["success"] is True
+        assert result["result"] == [{"n": 2}]
+
+    def test_replaced_loaded_table_restored(self):
+        """CREATE OR REPLACE / DELETE on a loaded table don't persist."""
+        data = {"users": [{"id": 1}, {"id": 2}]}
+        session = SQLSession()
+        session.execute(data, "CREATE OR REPLACE TABLE users AS SELECT 1 AS x")
+        session.execute(data, "DELETE FROM users")
+        result = session.execute(data, "SELECT MAX(id) AS m FROM users")
+        session.close()
+
+        assert result["result"] == [{"m": 2}]
+
+    def test_commit_resets_session(self):
+        """A query that commits its own changes gets a fresh connection afterwards."""
+        data = {"users": [{"id": 1}, {"id": 2}]}
+        session = SQLSession()
+        session.execute(data, "DROP TABLE users; COMMIT")
+        result = session.execute(data, "SELECT COUNT(*) AS n FROM users")
+        session.close()
+
+        assert result["result"] == [{"n": 2}]
+
+    def test_failed_query_does_not_break_session(self):
+        """A failing statement after DDL rolls back and leaves the session usable."""
+        data = {"users": [{"id": 1}]}
+        session = SQLSession()
+        failed = session.execute(data, "CREATE TABLE t AS SELECT 1 AS x; SELECT * FROM missing")
+        result = session.execute(data, "CREATE TABLE t AS SELECT 2 AS x; SELECT x FROM t")
+        session.close()
+
+        assert failed["success"] is False
+        assert result["result"] == [{"x": 2}]
+
+
 class TestGetTableSchemaSummary:
     """Test get_table_schema_summary function."""
 
@@ -188,6 +285,22 @@ class TestGetTableSchemaSummary:
         assert result["rows"] == 0
         assert result["schema"] == ""
 
+    def test_large_table_schema_from_strided_sample(self):
+        """Large tables infer types from a bounded sample but report the full row count."""
+        from unittest.mock import patch
+
+        from api_agent import executor
+
+        data = [{"id": i, "name": f"u{i}"} for i in range(5000)]
+        data[4000]["late_field"] = "x"  # Late row: a strided sample reaches it, a prefix wouldn't
+
+        with patch.object(executor, "_write_temp_json", wraps=executor._write_temp_json) as write:
+            result = get_table_schema_summary(data, "users")
+
+        assert result["rows"] == 5000
+        assert len(write.call_args.args[0]) <= executor._SCHEMA_SAMPLE_ROWS
+        assert "late_field" in result["schema"]
+
     def test_hint_contains_table_name(self):
         """Hint includes table name for queries."""
         data = [{"id": 1}]
@@ -195,6 +308,19 @@ class TestGetTableSchemaSummary:
 
         assert "my_table" in result["hint"]
 
+    def test_schema_db_opened_once(self):
+        """Repeated schema inference reuses one in-memory database (cursor per call)."""
+        from unittest.mock import patch
+
+        from api_agent import executor
+
+        get_table_schema_summary([{"id": 1}], "warm")
+        with patch.object(executor.duckdb, "connect") as connect:
+            result = get_table_schema_summary([{"id": 1, "ok": True}], "t")
+
+        connect.assert_not_called()
+        assert result["schema"] == "id: BIGINT, ok: BOOLEAN"
+
 
 class TestTruncateForContext:
     """Test truncate_for_context function."""
@@ -234,12 +360,12 @@ class TestTruncateForContext:
         assert result["truncated"] is True
         assert isinstance(result["data"], list)
         # Serialized data should fit within limit
-        assert len(json.dumps(result["data"])) <= 500
+        assert len(json_utils.dumps_bytes(result["data"])) <= 500
 
     def test_exact_limit_no_truncation(self):
         """Data exactly at limit doesn't truncate."""
         data = [{"id": 1}]
-        data_str_len = len('[{"id": 1}]')
+        data_str_len = len('[{"id":1}]')
         result = truncate_for_context(data, "test", max_chars=data_str_len)
 
         assert result["truncated"] is False
@@ -247,6 +373,44 @@ class TestTruncateForContext:
         assert result["table"] == "test"
         assert result["rows"] == 1
 
+    def test_fitting_data_returned_by_reference(self):
+        """No-truncation path returns the original list object, not a copy."""
+        data = [{"id": 1}, {"id": 2}]
+
+        assert truncate_for_context(data, "t")["data"] is data
+
+    def test_budget_counts_utf8_bytes(self):
+        """Budget is measured on the compact UTF-8 encoding tools respond with."""
+        data = [{"name": "é" * 10} for _ in range(10)]
+        result = truncate_for_context(data, "test", max_chars=100)
+
+        assert result["showing"] == 3  # 2 + 3 * 30 + 2 commas <= 100
+        assert len(json_utils.dumps_bytes(result["data"])) <= 100
+
+    def test_stops_serializing_after_budget(self):
+        """Rows past the first overflow are never serialized."""
+
+        class Unserializable:
+            pass
+
+        data = [{"id": i, "content": "x" * 100} for i in range(10)]
+        data.append({"id": 10, "content": Unserializable()})
+        result = truncate_for_context(data, "test", max_chars=500)
+
+        assert result["truncated"] is True
+        assert result["rows"] == 11
+        assert result["showing"] == 4
+
+    def test_int_beyond_64_bits(self):
+        """HUGEINT results (ints orjson can't encode) are sized and truncated, not raised."""
+        big = execute_sql([{"x": 1}], "SELECT 2::HUGEINT << 70 AS h")["result"][0]["h"]
+        rows = [{"id": i, "h": big} for i in range(100)]
+
+        assert truncate_for_context([{"s": 2**70}], "t", max_chars=10000)["truncated"] is False
+        result = truncate_for_context(rows, "t", max_chars=500)
+        assert result["truncated"] is True
+        assert len(json_utils.dumps_bytes(result["data"])) <= 500
+
     def test_schema_contains_column_types(self):
         """Truncated result schema contains column types."""
         data = [{"id": i, "name": f"user{i}", "active": True, "score": 99.5} for i in range(100)]
@@ -0,0 +1,178 @@
+"""Tests for graphql_query / graphql_query_batch aliasing and tool behavior."""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from api_agent.agent.graphql_agent import _alias_root_field
+
+
+@pytest.fixture
+def ctx():
+    from api_agent.agent.graphql_agent import _recipe_steps
+    from api_agent.context import RequestContext
+
+    _recipe_steps.set([])
+    return RequestContext(
+        target_url="https://api.example.com/graphql",
+        api_type="graphql",
+        target_headers={},
+        allow_unsafe_paths=(),
+        base_url=None,
+        include_result=False,
+        poll_paths=(),
+    )
+
+
+class TestAliasRootField:
+    """Test single-root query aliasing."""
+
+    def test_simple(self):
+        assert _alias_root_field("{ users { id name } }", "u") == "u: users { id name }"
+
+    def test_with_args(self):
+        q = '{ users(limit: 10, filter: "a{b}") { id } }'
+        assert _alias_root_field(q, "u") == 'u: users(limit: 10, filter: "a{b}") { id }'
+
+    def test_query_keyword_and_name(self):
+        assert _alias_root_field("query GetUsers { users { id } }", "u") == "u: users { id }"
+
+    def test_existing_alias_replaced(self):
+        assert _alias_root_field("{ people: users { id } }", "u") == "u: users { id }"
+
+    def test_scalar_root(self):
+        assert _alias_root_field("{ version }", "v") == "v: version"
+
+    def test_multiple_roots_rejected(self):
+        assert _alias_root_field("{ users { id } posts { id } }", "x") is None
+
+    def test_not_a_selection_set(self):
+        assert _alias_root_field("users { id }", "x") is None
+
+    def test_unbalanced_rejected(self):
+        assert _alias_root_field("{ users { id }", "x") is None
+
+
+class TestGraphQLBatchTool:
+    """Test graphql_query_batch tool."""
+
+    @pytest.fixture
+    def batch_tool(self, ctx):
+        from api_agent.agent.graphql_agent import _create_graphql_batch_tool
+
+        return _create_graphql_batch_tool(ctx)
+
+    @pytest.mark.asyncio
+    async def test_single_request_split_into_tables(self, ctx, batch_tool):
+        from api_agent.agent.graphql_agent import _recipe_steps
+
+        mock_fetch = AsyncMock(
+            return_value={
+                "success": True,
+                "data": {"u": [{"id": 1, "name": "a"}], "p": [{"authorId": 1, "title": "t"}]},
+            }
+        )
+        with patch("api_agent.agent.graphql_agent.graphql_fetch", mock_fetch):
+            result = await batch_tool.on_invoke_tool(
+                None,
+                json.dumps(
+                    {
+                        "queries": [
+                            {"name": "u", "query": "{ users { id name } }"},
+                            {"name": "p", "query": "{ posts { authorId title } }"},
+                        ]
+                    }
+                ),
+            )
+
+        assert mock_fetch.await_count == 1
+        document = mock_fetch.await_args.args[0]
+        assert "u: users { id name }" in document
+        assert "p: posts { authorId title }" in document
+
+        result_dict = json.loads(result)
+        assert result_dict["success"] is True
+        assert result_dict["tables"]["u"]["rows"] == 1
+        assert result_dict["tables"]["p"]["data"] == [{"authorId": 1, "title": "t"}]
+
+        assert set(ctx.state.results) == {"u", "p"}
+        assert ctx.state.queries == [document]
+        assert [s["name"] for s in _recipe_steps.get()] == ["u", "p"]
+
+    @pytest.mark.asyncio
+    async def test_multi_root_query_rejected(self, batch_tool):
+        mock_fetch = AsyncMock()
+        with patch("api_agent.agent.graphql_agent.graphql_fetch", mock_fetch):
+            result = await batch_tool.on_invoke_tool(
+                None,
+                json.dumps({"queries": [{"name": "x", "query": "{ users { id } posts { id } }"}]}),
+            )
+
+        assert mock_fetch.await_count == 0
+        assert "exactly one root field" in json.loads(result)["error"]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_names_rejected(self, batch_tool):
+        result = await batch_tool.on_invoke_tool(
+            None,
+            json.dumps(
+                {
+                    "queries": [
+                        {"name": "x", "query": "{ users { id } }"},
+                        {"name": "x", "query": "{ posts { id } }"},
+                    ]
+                }
+            ),
+        )
+        assert "duplicate name" in json.loads(result)["error"]
+
+
+class TestGraphQLQueryTool:
+    """Test graphql_query responses without an extractable table."""
+
+    @pytest.fixture
+    def query_tool(self, ctx):
+        from api_agent.agent.graphql_agent import _create_graphql_query_tool
+
+        return _create_graphql_query_tool(ctx)
+
+    @pytest.mark.asyncio
+    async def test_success_without_rows_returns_preview(self, query_tool):
+        mock_fetch = AsyncMock(
+            return_value={"success": True, "data": {"users": [], "blob": "x" * 50_000}}
+        )
+        with patch("api_agent.agent.graphql_agent.graphql_fetch", mock_fetch):
+            result = await query_tool.on_invoke_tool(
+                None, json.dumps({"query": "{ users { id } blob }", "name": "u"})
+            )
+
+        assert len(result) < 2000
+        result_dict = json.loads(result)
+        assert result_dict["success"] is True
+        assert result_dict["table"] == "u"
+        assert "users" in result_dict["preview"]
+        assert "data" not in result_dict
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("debug", [False, True])
+    async def test_result_preview_only_built_in_debug(self, query_tool, debug):
+        from api_agent import json_utils
+
+        mock_fetch = AsyncMock(return_value={"success": True, "data": {"users": [{"id": 1}]}})
+        with (
+            patch("api_agent.agent.graphql_agent.graphql_fetch", mock_fetch),
+            patch("api_agent.agent.graphql_agent.settings.DEBUG", debug),
+            patch.object(json_utils, "preview", wraps=json_utils.preview) as preview,
+        ):
+            await query_tool.on_invoke_tool(None, json.dumps({"query": "{ users { id } }"}))
+
+        assert preview.called is debug
+
+    @pytest.mark.asyncio
+    async def test_failure_returns_full_result(self, query_tool):
+        mock_fetch = AsyncMock(return_value={"success": False, "error": "boom"})
+        with patch("api_agent.agent.graphql_agent.graphql_fetch", mock_fetch):
+            result = await query_tool.on_invoke_tool(None, json.dumps({"query": "{ users }"}))
+
+        assert json.loads(result) == {"success": False, "error": "boom"}
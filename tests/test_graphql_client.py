@@ -0,0 +1,83 @@
+"""Tests for GraphQL client connection reuse."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from api_agent.graphql import client as gql_client
+
+
+class TestSharedClient:
+    """Test shared keep-alive client."""
+
+    @pytest.mark.asyncio
+    async def test_reused_within_loop(self):
+        assert gql_client._get_client() is gql_client._get_client()
+
+    @pytest.mark.asyncio
+    async def test_recreated_when_closed(self):
+        first = gql_client._get_client()
+        await first.aclose()
+
+        assert gql_client._get_client() is not first
+
+    @pytest.mark.asyncio
+    async def test_stale_client_closed_when_loop_changes(self):
+        first = gql_client._get_client()
+        gql_client._client_loop = asyncio.new_event_loop()  # As if created under a previous loop
+        gql_client._client_loop.close()
+        second = gql_client._get_client()
+        await asyncio.sleep(0)  # Let the background close run
+
+        assert second is not first
+        assert first.is_closed
+
+    @pytest.mark.asyncio
+    async def test_aclose_client(self):
+        first = gql_client._get_client()
+        await gql_client.aclose_client()
+
+        assert first.is_closed
+        assert gql_client._get_client() is not first
+
+    @pytest.mark.asyncio
+    async def test_execute_query_uses_shared_client(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json={"data": {"users": [{"id": 1}]}})
+
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch.object(gql_client, "_get_client", return_value=shared):
+            first = await gql_client.execute_query("{ users { id } }", None, "https://x/graphql")
+            second = await gql_client.execute_query("{ users { id } }", None, "https://x/graphql")
+        await shared.aclose()
+
+        assert first == {"success": True, "data": {"users": [{"id": 1}]}}
+        assert second == first
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_utf16_body_falls_back(self):
+        body = '{"data": {"name": "Zoë"}}'.encode("utf-16")
+        response = httpx.Response(200, content=body, headers={"content-type": "application/json"})
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: response))
+        with patch.object(gql_client, "_get_client", return_value=shared):
+            result = await gql_client.execute_query("{ name }", None, "https://x/graphql")
+        await shared.aclose()
+
+        assert result == {"success": True, "data": {"name": "Zoë"}}
+
+    @pytest.mark.asyncio
+    async def test_wide_int_kept_exact(self):
+        body = b'{"data": {"order": {"id": 123456789012345678901234567890}}}'
+        response = httpx.Response(200, content=body, headers={"content-type": "application/json"})
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: response))
+        with patch.object(gql_client, "_get_client", return_value=shared):
+            result = await gql_client.execute_query("{ order { id } }", None, "https://x/graphql")
+        await shared.aclose()
+
+        assert result["data"]["order"]["id"] == 123456789012345678901234567890
@@ -0,0 +1,75 @@
+"""Tests for orjson-backed JSON helpers."""
+
+import json
+from decimal import Decimal
+
+import pytest
+
+from api_agent import json_utils
+from api_agent.json_utils import dumps, dumps_bytes, preview
+
+
+class TestDumps:
+    """Test dumps parity with stdlib json."""
+
+    def test_compact_roundtrip(self):
+        obj = {"a": [1, 2, {"b": None}], "c": "x"}
+        assert json.loads(dumps(obj)) == obj
+
+    def test_indent_matches_stdlib(self):
+        obj = {"success": True, "data": [{"id": 1, "name": "a"}]}
+        assert dumps(obj, indent=True) == json.dumps(obj, indent=2)
+
+    def test_non_str_keys(self):
+        assert json.loads(dumps({1: "a"})) == {"1": "a"}
+
+    def test_decimal_falls_back_to_str(self):
+        assert json.loads(dumps({"price": Decimal("1.50")})) == {"price": "1.50"}
+
+    def test_int_beyond_64_bits(self):
+        obj = {"sum": 2**70, "name": "Zoë"}
+        assert json.loads(dumps(obj)) == obj
+        assert dumps(obj, indent=True) == json.dumps(obj, indent=2, ensure_ascii=False)
+        assert dumps_bytes(obj) == b'{"sum":1180591620717411303424,"name":"Zo\xc3\xab"}'
+
+
+class TestPreview:
+    """Test bounded debug previews."""
+
+    def test_short_value(self):
+        assert preview({"success": True}) == "{'success': True}"
+
+    def test_bounded_for_large_payload(self):
+        big = {"success": True, "data": [{"id": i, "name": "x" * 1000} for i in range(10000)]}
+        out = preview(big)
+        assert len(out) <= 200
+        assert out.startswith("{")
+
+
+class TestLazyDump:
+    """Test deferred serialization."""
+
+    def test_serializes_on_first_call_only(self):
+        from unittest.mock import patch
+
+        lazy = json_utils.LazyDump({"a": 1}, indent=True)
+        with patch.object(json_utils, "dumps_bytes", wraps=json_utils.dumps_bytes) as spy:
+            assert spy.call_count == 0
+            first = lazy()
+            second = lazy()
+
+        assert first == b'{\n  "a": 1\n}'
+        assert first is second
+        assert spy.call_count == 1
+
+
+class TestLoads:
+    """Test loads parity with stdlib json."""
+
+    def test_bytes_roundtrip(self):
+        raw = '{"name": "Café", "ids": [1, 2.5, null]}'.encode()
+        assert json_utils.loads(raw) == json.loads(raw)
+
+    def test_invalid_raises_json_error(self):
+        with pytest.raises(json.JSONDecodeError):
+            json_utils.loads(b"<html>")
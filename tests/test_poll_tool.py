@@ -2,7 +2,14 @@
 
 import pytest
 
-from api_agent.agent.rest_agent import _get_nested_value, _set_nested_value
+from api_agent.agent.rest_agent import (
+    _compile_done_check,
+    _compile_path,
+    _compile_set_path,
+    _get_compiled_value,
+    _get_nested_value,
+    _set_nested_value,
+)
 
 
 class TestGetNestedValue:
@@ -50,6 +57,50 @@ class TestGetNestedValue:
         assert _get_nested_value(data, "trips.0.isCompleted") is True
 
 
+class TestCompiledPath:
+    """Test pre-compiled dot paths used in the poll loop."""
+
+    def test_compile_marks_indexes(self):
+        assert _compile_path("trips.0.done") == (("trips", None), ("0", 0), ("done", None))
+
+    def test_reused_across_responses(self):
+        steps = _compile_path("trips.0.isCompleted")
+        assert _get_compiled_value({"trips": [{"isCompleted": False}]}, steps) is False
+        assert _get_compiled_value({"trips": [{"isCompleted": True}]}, steps) is True
+        assert _get_compiled_value({"trips": []}, steps) is None
+
+    def test_digit_key_on_dict(self):
+        assert _get_compiled_value({"items": {"0": "x"}}, _compile_path("items.0")) == "x"
+
+    def test_compiled_once_per_path(self):
+        assert _compile_path("polling.completed") is _compile_path("polling.completed")
+
+
+class TestDoneCheck:
+    """Test typed done_value matching (same result as str(current).lower() compare)."""
+
+    @pytest.mark.parametrize(
+        "done_value,current,expected",
+        [
+            ("true", True, True),
+            ("TRUE", True, True),
+            ("true", False, False),
+            ("false", False, True),
+            ("0", 0, True),
+            ("0", False, False),
+            ("05", 5, False),
+            ("-3", -3, True),
+            ("1", 1.0, False),
+            ("1.0", 1.0, True),
+            ("completed", "COMPLETED", True),
+            ("none", None, True),
+        ],
+    )
+    def test_matches_string_semantics(self, done_value, current, expected):
+        assert _compile_done_check(done_value)(current) is expected
+        assert (str(current).lower() == done_value.lower()) is expected
+
+
 class TestSetNestedValue:
     """Test dot-notation value setting."""
 
@@ -74,6 +125,23 @@ class TestSetNestedValue:
         assert data == {"foo": "bar"}
 
 
+class TestCompileSetPath:
+    """Test resolving the parent dict for repeated writes."""
+
+    def test_returns_parent_and_leaf(self):
+        data = {"polling": {"count": 1}}
+        parent, key = _compile_set_path(data, "polling.count")
+        parent[key] += 1
+        assert data["polling"]["count"] == 2
+
+    @pytest.mark.parametrize(
+        "data",
+        [{}, {"polling": {}}, {"polling": {"count": None}}, {"polling": 5}, {"polling": [1]}],
+    )
+    def test_missing_or_non_dict_returns_none(self, data):
+        assert _compile_set_path(data, "polling.count") is None
+
+
 class TestPollBlocking:
     """Test that poll_until_done respects allow_unsafe_paths."""
 
@@ -81,7 +149,7 @@ class TestPollBlocking:
     async def test_post_blocked_without_whitelist(self):
         import json
 
-        from api_agent.agent.rest_agent import _create_poll_tool
+        from api_agent.agent.rest_agent import _rest_target, poll_until_done
         from api_agent.context import RequestContext
 
         ctx = RequestContext(
@@ -93,7 +161,8 @@ class TestPollBlocking:
             include_result=False,
             poll_paths=(),
         )
-        poll_tool = _create_poll_tool(ctx, "https://api.example.com")
+        _rest_target.set((ctx, "https://api.example.com"))
+        poll_tool = poll_until_done
 
         result = await poll_tool.on_invoke_tool(
             None,
@@ -115,7 +184,7 @@ class TestPollBlocking:
     async def test_post_allowed_with_whitelist(self):
         import json
 
-        from api_agent.agent.rest_agent import _create_poll_tool
+        from api_agent.agent.rest_agent import _rest_target, poll_until_done
         from api_agent.context import RequestContext
 
         ctx = RequestContext(
@@ -127,7 +196,8 @@ class TestPollBlocking:
             include_result=False,
             poll_paths=(),
         )
-        poll_tool = _create_poll_tool(ctx, "https://api.example.com")
+        _rest_target.set((ctx, "https://api.example.com"))
+        poll_tool = poll_until_done
 
         result = await poll_tool.on_invoke_tool(
             None,
@@ -155,7 +225,7 @@ class TestPollGuardrails:
         import json
         from unittest.mock import AsyncMock, patch
 
-        from api_agent.agent.rest_agent import _create_poll_tool
+        from api_agent.agent.rest_agent import _rest_target, poll_until_done
         from api_agent.context import RequestContext
 
         ctx = RequestContext(
@@ -167,7 +237,8 @@ class TestPollGuardrails:
             include_result=False,
             poll_paths=(),
         )
-        poll_tool = _create_poll_tool(ctx, "https://api.example.com")
+        _rest_target.set((ctx, "https://api.example.com"))
+        poll_tool = poll_until_done
 
         # Mock response without the expected done_field
         mock_response = {"status": "pending", "results": []}
@@ -202,7 +273,7 @@ class TestPollGuardrails:
         import time
         from unittest.mock import AsyncMock, patch
 
-        from api_agent.agent.rest_agent import _create_poll_tool
+        from api_agent.agent.rest_agent import _rest_target, poll_until_done
         from api_agent.context import RequestContext
 
         ctx = RequestContext(
@@ -214,7 +285,8 @@ class TestPollGuardrails:
             include_result=False,
             poll_paths=(),
         )
-        poll_tool = _create_poll_tool(ctx, "https://api.example.com")
+        _rest_target.set((ctx, "https://api.example.com"))
+        poll_tool = poll_until_done
 
         call_times = []
 
@@ -255,7 +327,8 @@ class TestPollGuardrails:
         import json
         from unittest.mock import AsyncMock, patch
 
-        from api_agent.agent.rest_agent import _create_poll_tool
+        from api_agent.agent.rest_agent import _rest_target, poll_until_done
+        from api_agent.config import settings
         from api_agent.context import RequestContext
 
         ctx = RequestContext(
@@ -267,15 +340,19 @@ class TestPollGuardrails:
             include_result=False,
             poll_paths=(),
         )
-        poll_tool = _create_poll_tool(ctx, "https://api.example.com")
-
-        with patch(
-            "api_agent.agent.rest_agent.execute_request",
-            new_callable=AsyncMock,
-            return_value={
-                "success": True,
-                "data": {"polling": {"completed": False}},
-            },
+        _rest_target.set((ctx, "https://api.example.com"))
+        poll_tool = poll_until_done
+
+        with (
+            patch(
+                "api_agent.agent.rest_agent.execute_request",
+                new_callable=AsyncMock,
+                return_value={
+                    "success": True,
+                    "data": {"polling": {"completed": False}},
+                },
+            ),
+            patch("api_agent.agent.rest_agent.asyncio.sleep", new_callable=AsyncMock) as sleep,
         ):
             result = await poll_tool.on_invoke_tool(
                 None,
@@ -294,6 +371,8 @@ class TestPollGuardrails:
             assert "max_polls" in result_dict["error"].lower() or "exceeded" in result_dict["error"]
             # Should show what the actual value was
             assert "false" in result_dict["error"].lower() or "False" in result_dict["error"]
+            # No wait after the final attempt
+            assert sleep.await_count == settings.MAX_POLLS - 1
 
     @pytest.mark.asyncio
     async def test_auto_increment_polling_count(self):
@@ -301,7 +380,7 @@ class TestPollGuardrails:
         import json
         from unittest.mock import AsyncMock, patch
 
-        from api_agent.agent.rest_agent import _create_poll_tool
+        from api_agent.agent.rest_agent import _rest_target, poll_until_done
         from api_agent.context import RequestContext
 
         ctx = RequestContext(
@@ -313,7 +392,8 @@ class TestPollGuardrails:
             include_result=False,
             poll_paths=(),
         )
-        poll_tool = _create_poll_tool(ctx, "https://api.example.com")
+        _rest_target.set((ctx, "https://api.example.com"))
+        poll_tool = poll_until_done
 
         received_bodies = []
 
@@ -350,6 +430,9 @@ class TestPollGuardrails:
             assert received_bodies[0]["polling"]["count"] == 1
             assert received_bodies[1]["polling"]["count"] == 2
             assert received_bodies[2]["polling"]["count"] == 3
+            # Call log tracks the body actually sent on each attempt
+            logged = [json.loads(c.body)["polling"]["count"] for c in ctx.state.api_calls]
+            assert logged == [1, 2, 3]
 
     @pytest.mark.asyncio
     async def test_numeric_done_field_zero_means_done(self):
@@ -357,7 +440,7 @@ class TestPollGuardrails:
         import json
         from unittest.mock import AsyncMock, patch
 
-        from api_agent.agent.rest_agent import _create_poll_tool
+        from api_agent.agent.rest_agent import _rest_target, poll_until_done
         from api_agent.context import RequestContext
 
         ctx = RequestContext(
@@ -369,7 +452,8 @@ class TestPollGuardrails:
             include_result=False,
             poll_paths=(),
         )
-        poll_tool = _create_poll_tool(ctx, "https://api.example.com")
+        _rest_target.set((ctx, "https://api.example.com"))
+        poll_tool = poll_until_done
 
         call_count = 0
 
@@ -408,7 +492,7 @@ class TestPollGuardrails:
         """Invalid body JSON should return a friendly error."""
         import json
 
-        from api_agent.agent.rest_agent import _create_poll_tool
+        from api_agent.agent.rest_agent import _rest_target, poll_until_done
         from api_agent.context import RequestContext
 
         ctx = RequestContext(
@@ -420,7 +504,8 @@ class TestPollGuardrails:
             include_result=False,
             poll_paths=(),
         )
-        poll_tool = _create_poll_tool(ctx, "https://api.example.com")
+        _rest_target.set((ctx, "https://api.example.com"))
+        poll_tool = poll_until_done
 
         result = await poll_tool.on_invoke_tool(
             None,
@@ -444,7 +529,7 @@ class TestPollGuardrails:
         import json
         from unittest.mock import AsyncMock, patch
 
-        from api_agent.agent.rest_agent import _create_poll_tool
+        from api_agent.agent.rest_agent import _rest_target, poll_until_done
         from api_agent.context import RequestContext
 
         ctx = RequestContext(
@@ -456,7 +541,8 @@ class TestPollGuardrails:
             include_result=False,
             poll_paths=(),
         )
-        poll_tool = _create_poll_tool(ctx, "https://api.example.com")
+        _rest_target.set((ctx, "https://api.example.com"))
+        poll_tool = poll_until_done
 
         call_count = 0
 
@@ -488,3 +574,200 @@ class TestPollGuardrails:
             )
             result_dict = json.loads(result)
             assert result_dict["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_accepts_structured_body_and_params(self):
+        """Object args (not JSON strings) should be passed through unchanged."""
+        import json
+        from unittest.mock import AsyncMock, patch
+
+        from api_agent.agent.rest_agent import _rest_target, poll_until_done
+        from api_agent.context import RequestContext
+
+        ctx = RequestContext(
+            target_url="",
+            api_type="rest",
+            target_headers={},
+            allow_unsafe_paths=("/status/*",),
+            base_url=None,
+            include_result=False,
+            poll_paths=(),
+        )
+        _rest_target.set((ctx, "https://api.example.com"))
+        poll_tool = poll_until_done
+        mock = AsyncMock(return_value={"success": True, "data": {"done": True}})
+
+        with patch("api_agent.agent.rest_agent.execute_request", mock):
+            result = await poll_tool.on_invoke_tool(
+                None,
+                json.dumps(
+                    {
+                        "method": "POST",
+                        "path": "/status/check",
+                        "body": {"query": "test"},
+                        "query_params": {"limit": 5},
+                        "done_field": "done",
+                        "done_value": "true",
+                    }
+                ),
+            )
+
+        assert json.loads(result)["success"] is True
+        args = mock.call_args
+        assert args.args[3] == {"limit": 5}
+        assert args.kwargs["body"] == {"query": "test"}
+        assert [c.to_dict() for c in ctx.state.api_calls] == [
+            {
+                "method": "POST",
+                "path": "/status/check",
+                "path_params": "",
+                "query_params": '{"limit":5}',
+                "body": '{"query":"test"}',
+                "name": "poll_result",
+                "poll_attempt": 1,
+                "success": True,
+            }
+        ]
+
+    @pytest.mark.asyncio
+    async def test_delay_backs_off_up_to_cap(self):
+        """Default delay between polls should grow 1.5x per attempt, capped by MAX_POLL_DELAY_MS."""
+        import json
+        from unittest.mock import AsyncMock, patch
+
+        from api_agent.agent.rest_agent import _rest_target, poll_until_done
+        from api_agent.context import RequestContext
+
+        ctx = RequestContext(
+            target_url="",
+            api_type="rest",
+            target_headers={},
+            allow_unsafe_paths=(),
+            base_url=None,
+            include_result=False,
+            poll_paths=(),
+        )
+        _rest_target.set((ctx, "https://api.example.com"))
+        poll_tool = poll_until_done
+        responses = [{"success": True, "data": {"done": i >= 4}} for i in range(5)]
+        sleep = AsyncMock()
+
+        with (
+            patch(
+                "api_agent.agent.rest_agent.execute_request",
+                new_callable=AsyncMock,
+                side_effect=responses,
+            ),
+            patch("api_agent.agent.rest_agent.asyncio.sleep", sleep),
+            patch("api_agent.agent.rest_agent.random.uniform", return_value=0.0),
+            patch("api_agent.agent.rest_agent.settings.DEFAULT_POLL_DELAY_MS", 1000),
+            patch("api_agent.agent.rest_agent.settings.MAX_POLL_DELAY_MS", 2000),
+        ):
+            result = await poll_tool.on_invoke_tool(
+                None,
+                json.dumps(
+                    {
+                        "method": "GET",
+                        "path": "/status",
+                        "done_field": "done",
+                        "done_value": "true",
+                    }
+                ),
+            )
+
+        assert json.loads(result)["attempts"] == 5
+        # Sleeps are measured against a deadline, so next-request prep comes out of the delay
+        delays = [c.args[0] for c in sleep.call_args_list]
+        assert delays == pytest.approx([1.0, 1.5, 2.0, 2.0], abs=0.05)
+
+    @pytest.mark.asyncio
+    async def test_agent_delay_is_fixed_interval(self):
+        """An explicit delay_ms is used as-is for every poll: no backoff, jitter or cap."""
+        import json
+        from unittest.mock import AsyncMock, patch
+
+        from api_agent.agent.rest_agent import _rest_target, poll_until_done
+        from api_agent.context import RequestContext
+
+        ctx = RequestContext(
+            target_url="",
+            api_type="rest",
+            target_headers={},
+            allow_unsafe_paths=(),
+            base_url=None,
+            include_result=False,
+            poll_paths=(),
+        )
+        _rest_target.set((ctx, "https://api.example.com"))
+        poll_tool = poll_until_done
+        responses = [{"success": True, "data": {"done": i >= 4}} for i in range(5)]
+        sleep = AsyncMock()
+
+        with (
+            patch(
+                "api_agent.agent.rest_agent.execute_request",
+                new_callable=AsyncMock,
+                side_effect=responses,
+            ),
+            patch("api_agent.agent.rest_agent.asyncio.sleep", sleep),
+            patch("api_agent.agent.rest_agent.settings.MAX_POLL_DELAY_MS", 2000),
+        ):
+            result = await poll_tool.on_invoke_tool(
+                None,
+                json.dumps(
+                    {
+                        "method": "GET",
+                        "path": "/status",
+                        "done_field": "done",
+                        "done_value": "true",
+                        "delay_ms": 3000,
+                    }
+                ),
+            )
+
+        assert json.loads(result)["attempts"] == 5
+        delays = [c.args[0] for c in sleep.call_args_list]
+        assert delays == pytest.approx([3.0, 3.0, 3.0, 3.0], abs=0.05)
+
+    @pytest.mark.asyncio
+    async def test_default_delay_is_jittered(self):
+        """Without an agent delay_ms, each backoff step gets up to 10% jitter."""
+        import json
+        from unittest.mock import AsyncMock, patch
+
+        from api_agent.agent.rest_agent import _rest_target, poll_until_done
+        from api_agent.context import RequestContext
+
+        ctx = RequestContext(
+            target_url="",
+            api_type="rest",
+            target_headers={},
+            allow_unsafe_paths=(),
+            base_url=None,
+            include_result=False,
+            poll_paths=(),
+        )
+        _rest_target.set((ctx, "https://api.example.com"))
+        responses = [{"success": True, "data": {"done": i >= 2}} for i in range(3)]
+        sleep = AsyncMock()
+
+        with (
+            patch(
+                "api_agent.agent.rest_agent.execute_request",
+                new_callable=AsyncMock,
+                side_effect=responses,
+            ),
+            patch("api_agent.agent.rest_agent.asyncio.sleep", sleep),
+            patch("api_agent.agent.rest_agent.random.uniform", return_value=0.1) as uniform,
+            patch("api_agent.agent.rest_agent.settings.DEFAULT_POLL_DELAY_MS", 1000),
+        ):
+            await poll_until_done.on_invoke_tool(
+                None,
+                json.dumps(
+                    {"method": "GET", "path": "/status", "done_field": "done", "done_value": "true"}
+                ),
+            )
+
+        assert [c.args for c in uniform.call_args_list] == [(0, 0.1), (0, 0.1)]
+        delays = [c.args[0] for c in sleep.call_args_list]
+        assert delays == pytest.approx([1.1, 1.65], abs=0.05)
@@ -0,0 +1,54 @@
+"""Tests for shared prompt helpers and system prompt layout."""
+
+from datetime import date
+from unittest.mock import patch
+
+from api_agent.agent import prompts
+
+
+class TestCurrentDate:
+    """Test per-day cached current_date."""
+
+    def setup_method(self):
+        prompts._date_cache = (0.0, "")
+
+    def test_returns_today(self):
+        assert prompts.current_date() == date.today().isoformat()
+
+    def test_formats_once_until_midnight(self):
+        with patch.object(prompts, "datetime", wraps=prompts.datetime) as spy:
+            first = prompts.current_date()
+            second = prompts.current_date()
+
+        assert first == second
+        assert spy.now.call_count == 1
+
+    def test_refreshes_after_expiry(self):
+        prompts._date_cache = (1.0, "2000-01-01")
+
+        assert prompts.current_date() == date.today().isoformat()
+
+
+class TestSystemPromptPrefix:
+    """Per-request parts come last so the static prefix is cacheable."""
+
+    def test_graphql_static_prefix(self):
+        from api_agent.agent.graphql_agent import _render_system_prompt
+
+        a = _render_system_prompt("2026-01-01", "")
+        b = _render_system_prompt("2026-01-02", "<recipes>x</recipes>")
+        static_end = a.index("</examples>")
+
+        assert a[:static_end] == b[:static_end]
+        assert a.index("Today's date") > static_end
+
+    def test_rest_static_prefix(self):
+        from api_agent.agent.rest_agent import _render_system_prompt
+
+        a = _render_system_prompt((), "2026-01-01", "")
+        b = _render_system_prompt(("/jobs",), "2026-01-02", "<recipes>x</recipes>")
+        static_end = a.index("</examples>")
+
+        assert a[:static_end] == b[:static_end]
+        assert b.index("<polling-required>") > static_end
+        assert b.index("Today's date") > b.index("<polling-required>")
@@ -392,3 +392,41 @@ def test_rest_tool_return_directly_default(rest_context, rest_recipe_suggestions
         schema = tool.params_json_schema
         return_directly_param = schema["properties"]["return_directly"]
         assert return_directly_param["default"] is True
+
+
+def test_sql_steps_share_one_connection():
+    """Recipe SQL steps load each table once, not once per step."""
+    from contextvars import ContextVar
+
+    from api_agent import executor
+    from api_agent.recipe.common import _execute_sql_steps
+
+    last: ContextVar[list] = ContextVar("last")
+    last.set([None])
+    results = {"users": [{"id": 1}, {"id": 2}]}
+    steps = ["SELECT COUNT(*) AS n FROM users", "SELECT MAX(id) AS m FROM users"]
+
+    with patch.object(executor, "_load_table", wraps=executor._load_table) as spy:
+        ok, executed, error = _execute_sql_steps(steps, {}, results, last)
+
+    assert ok and error == ""
+    assert executed == steps
+    assert last.get()[0] == [{"m": 2}]
+    assert spy.call_count == 1
+
+
+def test_sql_step_ddl_does_not_leak_into_later_steps():
+    """A step that drops a loaded table doesn't break the steps after it."""
+    from contextvars import ContextVar
+
+    from api_agent.recipe.common import _execute_sql_steps
+
+    last: ContextVar[list] = ContextVar("last")
+    last.set([None])
+    results = {"users": [{"id": 1}, {"id": 2}]}
+    steps = ["DROP TABLE users", "SELECT COUNT(*) AS n FROM users"]
+
+    ok, executed, error = _execute_sql_steps(steps, {}, results, last)
+
+    assert ok and error == ""
+    assert last.get()[0] == [{"n": 2}]
@@ -1,7 +1,14 @@
 """Tests for REST client."""
 
+import asyncio
+import fnmatch
+import sys
+from unittest.mock import patch
+
+import httpx
 import pytest
 
+from api_agent.rest import client as rest_client
 from api_agent.rest.client import _build_url, _is_path_allowed, execute_request
 
 
@@ -29,6 +36,25 @@ class TestIsPathAllowed:
     def test_empty_patterns(self):
         assert _is_path_allowed("/search", []) is False
 
+    def test_whitelist_compiled_once(self):
+        """Repeated checks against the same whitelist reuse one compiled regex."""
+        rest_client._compile_globs.cache_clear()
+        patterns = ("/search", "/api/*/query")
+
+        for path in ("/search", "/api/v1/query", "/users"):
+            _is_path_allowed(path, patterns)
+
+        info = rest_client._compile_globs.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+
+    def test_glob_metacharacters_match_like_fnmatch(self):
+        patterns = ["/items/[0-9]", "/v?/ping"]
+        for path in ("/items/7", "/items/x", "/v1/ping", "/v10/ping", "/items/7/extra"):
+            assert _is_path_allowed(path, patterns) is any(
+                fnmatch.fnmatch(path, p) for p in patterns
+            )
+
     def test_nested_wildcard_pattern_matching(self):
         """Verify nested wildcard patterns match expected paths."""
         pattern = "/api/booking/search/*"
@@ -74,56 +100,61 @@ class TestBuildUrl:
         with pytest.raises(ValueError, match="No base URL provided"):
             _build_url("/users", base_url="")
 
+    def test_base_path_preserved(self):
+        url = _build_url("users", base_url="https://api.example.com/v2/")
+        assert url == "https://api.example.com/v2/users"
+
+    def test_colon_path_not_parsed_as_scheme(self):
+        url = _build_url("/users:search", base_url="https://api.example.com")
+        assert url == "https://api.example.com/users:search"
+
+    def test_absolute_url_path_stays_on_base_host(self):
+        url = _build_url("https://evil.example/steal", base_url="https://api.example.com")
+        assert url.startswith("https://api.example.com/")
+
 
 class TestExecuteRequest:
     """Test request execution and method blocking."""
 
-    @pytest.mark.asyncio
-    async def test_blocks_post_by_default(self):
-        result = await execute_request(
-            "POST",
-            "/users",
-            base_url="https://api.example.com",
-            body={"name": "test"},
-            allow_unsafe=False,
-        )
-        assert result["success"] is False
-        assert "not allowed" in result["error"]
+    @pytest.fixture
+    def mock_api(self):
+        """Serve requests from an in-process transport instead of the network."""
 
-    @pytest.mark.asyncio
-    async def test_blocks_put_by_default(self):
-        result = await execute_request(
-            "PUT",
-            "/users/123",
-            base_url="https://api.example.com",
-            body={"name": "test"},
-            allow_unsafe=False,
-        )
-        assert result["success"] is False
-        assert "not allowed" in result["error"]
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"ok": True})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch.object(rest_client, "_get_client", return_value=client):
+            yield
 
     @pytest.mark.asyncio
-    async def test_blocks_delete_by_default(self):
+    @pytest.mark.parametrize(
+        "method,path,body",
+        [
+            ("POST", "/users", {"name": "test"}),
+            ("PUT", "/users/123", {"name": "test"}),
+            ("DELETE", "/users/123", None),
+            ("PATCH", "/users/123", {"name": "test"}),
+        ],
+    )
+    async def test_blocks_unsafe_methods_by_default(self, method, path, body):
         result = await execute_request(
-            "DELETE",
-            "/users/123",
+            method,
+            path,
             base_url="https://api.example.com",
+            body=body,
             allow_unsafe=False,
         )
         assert result["success"] is False
         assert "not allowed" in result["error"]
 
     @pytest.mark.asyncio
-    async def test_blocks_patch_by_default(self):
-        result = await execute_request(
-            "PATCH",
-            "/users/123",
-            base_url="https://api.example.com",
-            body={"name": "test"},
-            allow_unsafe=False,
-        )
-        assert result["success"] is False
-        assert "not allowed" in result["error"]
+    async def test_unsupported_method_rejected_before_url_build(self):
+        with patch.object(rest_client, "_build_url") as build_url:
+            result = await execute_request("HEAD", "/users", base_url="https://api.example.com")
+
+        build_url.assert_not_called()
+        assert result == {"success": False, "error": "Unsupported method: HEAD"}
 
     @pytest.mark.asyncio
     async def test_no_base_url_returns_error(self):
@@ -132,17 +163,24 @@ class TestExecuteRequest:
         assert "No base URL" in result["error"]
 
     @pytest.mark.asyncio
-    async def test_post_allowed_with_matching_path(self):
-        # POST is allowed when path matches allow_unsafe_paths
+    @pytest.mark.parametrize(
+        "path,patterns",
+        [
+            ("/search", ["/search", "/_search"]),
+            ("/api/v1/search", ["/api/*/search"]),
+            # Nested wildcard pattern for search APIs
+            ("/api/booking/search/v1/hotels", ["/api/booking/search/*"]),
+        ],
+    )
+    async def test_post_allowed_with_matching_path(self, mock_api, path, patterns):
         result = await execute_request(
             "POST",
-            "/search",
+            path,
             base_url="https://api.example.com",
             body={"query": "test"},
-            allow_unsafe_paths=["/search", "/_search"],
+            allow_unsafe_paths=patterns,
         )
-        # Will fail with connection error (no real server) but NOT blocked
-        assert "not allowed" not in result.get("error", "")
+        assert result == {"success": True, "data": {"ok": True}}
 
     @pytest.mark.asyncio
     async def test_post_blocked_with_non_matching_path(self):
@@ -156,28 +194,123 @@ class TestExecuteRequest:
         assert result["success"] is False
         assert "not allowed" in result["error"]
 
+
+class TestSharedClient:
+    """Test shared keep-alive client."""
+
     @pytest.mark.asyncio
-    async def test_post_allowed_with_glob_pattern(self):
-        result = await execute_request(
-            "POST",
-            "/api/v1/search",
-            base_url="https://api.example.com",
-            body={"query": "test"},
-            allow_unsafe_paths=["/api/*/search"],
-        )
-        # Will fail with connection error but NOT blocked
-        assert "not allowed" not in result.get("error", "")
+    async def test_reused_within_loop(self):
+        assert rest_client._get_client() is rest_client._get_client()
 
     @pytest.mark.asyncio
-    async def test_nested_search_pattern(self):
-        """Test nested wildcard pattern for search APIs."""
-        # Should match /api/booking/search/v1/hotels
-        result = await execute_request(
-            "POST",
-            "/api/booking/search/v1/hotels",
-            base_url="https://api.example.com",
-            body={"query": "test"},
-            allow_unsafe_paths=["/api/booking/search/*"],
+    async def test_recreated_when_closed(self):
+        first = rest_client._get_client()
+        await first.aclose()
+
+        assert rest_client._get_client() is not first
+
+    @pytest.mark.asyncio
+    async def test_pool_caps_idle_connections_only(self):
+        """No shared total limit, so concurrent callers never queue on the pool."""
+        pool = rest_client._get_client()._transport._pool
+
+        assert pool._max_connections == sys.maxsize
+        assert pool._max_keepalive_connections == 32
+
+    @pytest.mark.asyncio
+    async def test_stale_client_closed_when_loop_changes(self):
+        first = rest_client._get_client()
+        rest_client._client_loop = asyncio.new_event_loop()  # As if created under a previous loop
+        rest_client._client_loop.close()
+        second = rest_client._get_client()
+        await asyncio.sleep(0)  # Let the background close run
+
+        assert second is not first
+        assert first.is_closed
+
+    @pytest.mark.asyncio
+    async def test_aclose_client(self):
+        first = rest_client._get_client()
+        await rest_client.aclose_client()
+
+        assert first.is_closed
+        assert rest_client._get_client() is not first
+
+    @pytest.mark.asyncio
+    async def test_requests_reuse_client_without_cookies(self):
+        seen_cookies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_cookies.append(request.headers.get("cookie"))
+            return httpx.Response(200, json={"ok": True}, headers={"set-cookie": "sid=1; Path=/"})
+
+        pooled = rest_client._get_client()
+        shared = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), cookies=pooled.cookies.jar
         )
-        # Will fail with connection error but NOT blocked
-        assert "not allowed" not in result.get("error", "")
+        with patch.object(rest_client, "_get_client", return_value=shared):
+            first = await execute_request("GET", "/a", base_url="https://api.example.com")
+            second = await execute_request("GET", "/a", base_url="https://api.example.com")
+        await shared.aclose()
+
+        assert first == second == {"success": True, "data": {"ok": True}}
+        # Set-Cookie from one response must not leak into later requests
+        assert seen_cookies == [None, None]
+
+
+class TestResponseParsing:
+    """Test JSON response body parsing."""
+
+    @staticmethod
+    async def _get(response: httpx.Response) -> dict:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: response))
+        with patch.object(rest_client, "_get_client", return_value=client):
+            result = await execute_request("GET", "/a", base_url="https://api.example.com")
+        await client.aclose()
+        return result
+
+    @pytest.mark.asyncio
+    async def test_parses_utf8_json(self):
+        result = await self._get(httpx.Response(200, json=[{"name": "Zoë"}]))
+
+        assert result == {"success": True, "data": [{"name": "Zoë"}]}
+
+    @pytest.mark.asyncio
+    async def test_utf16_body_falls_back(self):
+        body = '{"name": "Zoë"}'.encode("utf-16")
+        response = httpx.Response(200, content=body, headers={"content-type": "application/json"})
+
+        result = await self._get(response)
+
+        assert result == {"success": True, "data": {"name": "Zoë"}}
+
+    @pytest.mark.asyncio
+    async def test_wide_int_kept_exact(self):
+        body = b'{"id": 123456789012345678901234567890, "n": 1}'
+        response = httpx.Response(200, content=body, headers={"content-type": "application/json"})
+
+        result = await self._get(response)
+
+        assert result == {"success": True, "data": {"id": 123456789012345678901234567890, "n": 1}}
+
+    @pytest.mark.asyncio
+    async def test_post_body_sent_as_compact_json(self):
+        sent = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request)
+            return httpx.Response(200, json={"ok": True})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch.object(rest_client, "_get_client", return_value=client):
+            await execute_request(
+                "POST",
+                "/search",
+                body={"city": "Zürich", "n": 2},
+                base_url="https://api.example.com",
+                allow_unsafe=True,
+            )
+        await client.aclose()
+
+        assert sent[0].content == '{"city":"Zürich","n":2}'.encode()
+        assert sent[0].headers["content-type"] == "application/json"
@@ -104,6 +104,7 @@ class TestInferStringFormat:
         """Avoid false positives for 'updatedAt' style fields."""
         assert _infer_string_format("updateDate") == ""
         assert _infer_string_format("lastUpdated") == ""
+        assert _infer_string_format("updatedDateTime") == "date-time"
 
     def test_no_match(self):
         assert _infer_string_format("name") == ""
@@ -372,3 +373,79 @@ class TestBuildSchemaContext:
         ctx = build_schema_context(spec)
         assert "PUT /update(body: Data)" in ctx
         assert "body: Data!" not in ctx  # not required
+
+
+class TestSchemaCache:
+    """Test TTL cache around fetch_schema_context."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from api_agent.rest import schema_loader
+
+        schema_loader._schema_cache.clear()
+        yield
+        schema_loader._schema_cache.clear()
+
+    @staticmethod
+    def _spec():
+        return {
+            "openapi": "3.0.0",
+            "servers": [{"url": "https://api.example.com"}],
+            "paths": {"/users": {"get": {"responses": {"200": {"description": "ok"}}}}},
+        }
+
+    @pytest.mark.asyncio
+    async def test_reuses_cached_spec(self):
+        from unittest.mock import AsyncMock, patch
+
+        from api_agent.rest.schema_loader import fetch_schema_context
+
+        with patch(
+            "api_agent.rest.schema_loader.load_openapi_spec",
+            new_callable=AsyncMock,
+            return_value=self._spec(),
+        ) as mock_load:
+            first = await fetch_schema_context("https://api.example.com/openapi.json", {"a": "1"})
+            second = await fetch_schema_context("https://api.example.com/openapi.json", {"a": "1"})
+            await fetch_schema_context("https://api.example.com/openapi.json", {"a": "2"})
+
+        assert first == second
+        assert first[1] == "https://api.example.com"
+        assert mock_load.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_ttl_zero_disables_cache(self):
+        from unittest.mock import AsyncMock, patch
+
+        from api_agent.rest.schema_loader import fetch_schema_context
+
+        with (
+            patch(
+                "api_agent.rest.schema_loader.load_openapi_spec",
+                new_callable=AsyncMock,
+                return_value=self._spec(),
+            ) as mock_load,
+            patch("api_agent.rest.schema_loader.settings.SCHEMA_CACHE_TTL_SECONDS", 0),
+        ):
+            await fetch_schema_context("https://api.example.com/openapi.json")
+            await fetch_schema_context("https://api.example.com/openapi.json")
+
+        assert mock_load.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_load_not_cached(self):
+        from unittest.mock import AsyncMock, patch
+
+        from api_agent.rest import schema_loader
+
+        with patch(
+            "api_agent.rest.schema_loader.load_openapi_spec",
+            new_callable=AsyncMock,
+            return_value={},
+        ) as mock_load:
+            first = await schema_loader.fetch_schema_context("https://api.example.com/openapi.json")
+            await schema_loader.fetch_schema_context("https://api.example.com/openapi.json")
+
+        assert first == ("", "", "")
+        assert mock_load.await_count == 2
+        assert not schema_loader._schema_cache
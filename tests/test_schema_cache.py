@@ -0,0 +1,78 @@
+"""Tests for the shared schema TTL/LRU cache."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from api_agent.schema_cache import SchemaCache, schema_cache_key
+
+
+def test_key_includes_headers():
+    """Headers are part of the key, regardless of dict order."""
+    assert schema_cache_key("u", {"a": "1", "b": "2"}) == schema_cache_key(
+        "u", {"b": "2", "a": "1"}
+    )
+    assert schema_cache_key("u", {"a": "1"}) != schema_cache_key("u", {"a": "2"})
+    assert schema_cache_key("u", None) == schema_cache_key("u", {})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_fetch():
+    """Concurrent requests for the same key await a single loader call."""
+    cache = SchemaCache()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "schema"
+
+    results = await asyncio.gather(*(cache.get_or_load(("k",), loader, bool) for _ in range(5)))
+
+    assert results == ["schema"] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    """Oldest unused entry is evicted once the cache is full."""
+    cache = SchemaCache()
+    loads: list[str] = []
+
+    def loader(name):
+        async def load():
+            loads.append(name)
+            return name
+
+        return load
+
+    with patch("api_agent.schema_cache.settings.SCHEMA_CACHE_SIZE", 2):
+        await cache.get_or_load(("a",), loader("a"), bool)
+        await cache.get_or_load(("b",), loader("b"), bool)
+        await cache.get_or_load(("a",), loader("a"), bool)  # a is now most recent
+        await cache.get_or_load(("c",), loader("c"), bool)  # evicts b
+        await cache.get_or_load(("a",), loader("a"), bool)
+        await cache.get_or_load(("b",), loader("b"), bool)
+
+    assert loads == ["a", "b", "c", "b"]
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_result_not_stored():
+    """Results rejected by cacheable are returned but refetched next time."""
+    cache = SchemaCache()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        return ""
+
+    assert await cache.get_or_load(("k",), loader, bool) == ""
+    await cache.get_or_load(("k",), loader, bool)
+
+    assert calls == 2
+    assert not cache
@@ -1,5 +1,7 @@
 """Tests for SDL schema context generation."""
 
+import copy
+
 import pytest
 
 from api_agent.agent.graphql_agent import (
@@ -9,94 +11,95 @@ from api_agent.agent.graphql_agent import (
     _format_type,
 )
 
+_USER = {"name": "User", "kind": "OBJECT"}
 
-class TestFormatType:
-    """Test SDL type formatting."""
-
-    def test_scalar(self):
-        assert _format_type({"name": "String", "kind": "SCALAR"}) == "String"
 
-    def test_non_null(self):
-        t = {"kind": "NON_NULL", "ofType": {"name": "String", "kind": "SCALAR"}}
-        assert _format_type(t) == "String!"
+def _non_null(t: dict) -> dict:
+    return {"kind": "NON_NULL", "ofType": t}
 
-    def test_list(self):
-        t = {"kind": "LIST", "ofType": {"name": "User", "kind": "OBJECT"}}
-        assert _format_type(t) == "[User]"
 
-    def test_non_null_list(self):
-        t = {
-            "kind": "NON_NULL",
-            "ofType": {"kind": "LIST", "ofType": {"name": "User", "kind": "OBJECT"}},
-        }
-        assert _format_type(t) == "[User]!"
+def _list(t: dict) -> dict:
+    return {"kind": "LIST", "ofType": t}
 
-    def test_list_non_null(self):
-        t = {
-            "kind": "LIST",
-            "ofType": {"kind": "NON_NULL", "ofType": {"name": "User", "kind": "OBJECT"}},
-        }
-        assert _format_type(t) == "[User!]"
-
-    def test_deeply_nested(self):
-        t = {
-            "kind": "NON_NULL",
-            "ofType": {
-                "kind": "LIST",
-                "ofType": {
-                    "kind": "NON_NULL",
-                    "ofType": {
-                        "kind": "LIST",
-                        "ofType": {
-                            "kind": "NON_NULL",
-                            "ofType": {"name": "User", "kind": "OBJECT"},
-                        },
-                    },
-                },
-            },
-        }
-        assert _format_type(t) == "[[User!]!]!"
 
-    def test_none(self):
-        assert _format_type(None) == "?"
+class TestFormatType:
+    """Test SDL type formatting."""
 
-    def test_empty(self):
-        assert _format_type({}) == "?"
+    @pytest.mark.parametrize(
+        "t,expected",
+        [
+            pytest.param({"name": "String", "kind": "SCALAR"}, "String", id="scalar"),
+            pytest.param(_non_null({"name": "String", "kind": "SCALAR"}), "String!", id="non_null"),
+            pytest.param(_list(_USER), "[User]", id="list"),
+            pytest.param(_non_null(_list(_USER)), "[User]!", id="non_null_list"),
+            pytest.param(_list(_non_null(_USER)), "[User!]", id="list_non_null"),
+            pytest.param(
+                _non_null(_list(_non_null(_list(_non_null(_USER))))),
+                "[[User!]!]!",
+                id="deeply_nested",
+            ),
+            pytest.param(None, "?", id="none"),
+            pytest.param({}, "?", id="empty"),
+        ],
+    )
+    def test_format_type(self, t, expected):
+        assert _format_type(t) == expected
+
+    def test_wrapper_depth_beyond_recursion_limit(self):
+        """Pathologically deep wrapper chains format without recursing."""
+        import sys
+
+        depth = sys.getrecursionlimit() + 100
+        t = _USER
+        for _ in range(depth):
+            t = _list(t)
+
+        assert _format_type(t) == "[" * depth + "User" + "]" * depth
 
 
 class TestFormatArg:
     """Test argument formatting with default values."""
 
-    def test_arg_no_default(self):
-        arg = {"name": "limit", "type": {"name": "Int", "kind": "SCALAR"}}
-        assert _format_arg(arg) == "limit: Int"
-
-    def test_arg_with_default(self):
-        arg = {"name": "limit", "type": {"name": "Int", "kind": "SCALAR"}, "defaultValue": "10"}
-        assert _format_arg(arg) == "limit: Int = 10"
-
-    def test_arg_with_string_default(self):
-        arg = {
-            "name": "order",
-            "type": {"name": "String", "kind": "SCALAR"},
-            "defaultValue": '"ASC"',
-        }
-        assert _format_arg(arg) == 'order: String = "ASC"'
-
-    def test_arg_with_non_null_type(self):
-        arg = {
-            "name": "id",
-            "type": {"kind": "NON_NULL", "ofType": {"name": "ID", "kind": "SCALAR"}},
-        }
-        assert _format_arg(arg) == "id: ID!"
-
-    def test_arg_with_list_type_and_default(self):
-        arg = {
-            "name": "statuses",
-            "type": {"kind": "LIST", "ofType": {"name": "Status", "kind": "ENUM"}},
-            "defaultValue": "[ACTIVE]",
-        }
-        assert _format_arg(arg) == "statuses: [Status] = [ACTIVE]"
+    @pytest.mark.parametrize(
+        "arg,expected",
+        [
+            pytest.param(
+                {"name": "limit", "type": {"name": "Int", "kind": "SCALAR"}},
+                "limit: Int",
+                id="no_default",
+            ),
+            pytest.param(
+                {"name": "limit", "type": {"name": "Int", "kind": "SCALAR"}, "defaultValue": "10"},
+                "limit: Int = 10",
+                id="default",
+            ),
+            pytest.param(
+                {
+                    "name": "order",
+                    "type": {"name": "String", "kind": "SCALAR"},
+                    "defaultValue": '"ASC"',
+                },
+                'order: String = "ASC"',
+                id="string_default",
+            ),
+            pytest.param(
+                {"name": "id", "type": _non_null({"name": "ID", "kind": "SCALAR"})},
+                "id: ID!",
+                id="non_null_type",
+            ),
+            pytest.param(
+                {
+                    "name": "statuses",
+                    "type": _list({"name": "Status", "kind": "ENUM"}),
+                    "defaultValue": "[ACTIVE]",
+                },
+                "statuses: [Status] = [ACTIVE]",
+                id="list_type_and_default",
+            ),
+        ],
+    )
+    def test_format_arg(self, arg, expected):
+        assert _format_arg(arg) == expected
 
 
 class TestFormatField:
@@ -130,186 +133,207 @@ class TestFormatField:
         }
         assert _format_field(fld) == "  team: Team # Owner team"
 
-
-class TestBuildSchemaContext:
-    """Test SDL context generation."""
-
-    @pytest.fixture
-    def sample_schema(self):
-        """Realistic GraphQL schema fixture."""
-        return {
-            "queryType": {
-                "fields": [
+    def test_multiline_description_kept_on_one_line(self):
+        fld = {
+            "name": "team",
+            "args": [],
+            "type": {"name": "Team", "kind": "OBJECT"},
+            "description": "Owner team.\n\nSee docs  for details.\n",
+        }
+        assert _format_field(fld) == "  team: Team # Owner team. See docs for details."
+
+    def test_blank_description_omitted(self):
+        fld = {"name": "team", "args": [], "type": {"name": "Team", "kind": "OBJECT"}}
+        fld["description"] = "  \n "
+        assert _format_field(fld) == "  team: Team"
+
+
+# Realistic GraphQL schema; read-only tests share it, mutating tests take a deepcopy
+_SAMPLE_SCHEMA = {
+    "queryType": {
+        "fields": [
+            {
+                "name": "components",
+                "description": "List components",
+                "args": [
                     {
-                        "name": "components",
-                        "description": "List components",
-                        "args": [
-                            {
-                                "name": "names",
-                                "type": {
-                                    "kind": "LIST",
-                                    "ofType": {
-                                        "kind": "NON_NULL",
-                                        "ofType": {"name": "String", "kind": "SCALAR"},
-                                    },
-                                },
-                            },
-                            {"name": "type", "type": {"name": "Type", "kind": "ENUM"}},
-                        ],
+                        "name": "names",
                         "type": {
-                            "kind": "NON_NULL",
+                            "kind": "LIST",
                             "ofType": {
-                                "kind": "LIST",
-                                "ofType": {
-                                    "kind": "NON_NULL",
-                                    "ofType": {"name": "Component", "kind": "INTERFACE"},
-                                },
+                                "kind": "NON_NULL",
+                                "ofType": {"name": "String", "kind": "SCALAR"},
                             },
                         },
                     },
-                    {
-                        "name": "teams",
-                        "description": None,
-                        "args": [
-                            {
-                                "name": "ids",
-                                "type": {
-                                    "kind": "LIST",
-                                    "ofType": {"name": "ID", "kind": "SCALAR"},
-                                },
-                            }
-                        ],
-                        "type": {"kind": "LIST", "ofType": {"name": "Team", "kind": "OBJECT"}},
+                    {"name": "type", "type": {"name": "Type", "kind": "ENUM"}},
+                ],
+                "type": {
+                    "kind": "NON_NULL",
+                    "ofType": {
+                        "kind": "LIST",
+                        "ofType": {
+                            "kind": "NON_NULL",
+                            "ofType": {"name": "Component", "kind": "INTERFACE"},
+                        },
                     },
-                ]
+                },
             },
-            "types": [
-                # Interface: Component
-                {
-                    "name": "Component",
-                    "kind": "INTERFACE",
-                    "description": "Base component interface",
-                    "fields": [
-                        {
-                            "name": "id",
-                            "args": [],
-                            "type": {
-                                "kind": "NON_NULL",
-                                "ofType": {"name": "ID", "kind": "SCALAR"},
-                            },
-                        },
-                        {
-                            "name": "name",
-                            "args": [],
-                            "type": {
-                                "kind": "NON_NULL",
-                                "ofType": {"name": "String", "kind": "SCALAR"},
-                            },
-                        },
-                        {"name": "team", "args": [], "type": {"name": "Team", "kind": "OBJECT"}},
-                        {
-                            "name": "repositories",
-                            "description": "Code repositories",
-                            "args": [
-                                {"name": "search", "type": {"name": "String", "kind": "SCALAR"}},
-                                {"name": "first", "type": {"name": "Int", "kind": "SCALAR"}},
-                            ],
-                            "type": {"name": "ProjectConnection", "kind": "OBJECT"},
+            {
+                "name": "teams",
+                "description": None,
+                "args": [
+                    {
+                        "name": "ids",
+                        "type": {
+                            "kind": "LIST",
+                            "ofType": {"name": "ID", "kind": "SCALAR"},
                         },
-                    ],
-                    "possibleTypes": [{"name": "Service"}, {"name": "Job"}, {"name": "Library"}],
+                    }
+                ],
+                "type": {"kind": "LIST", "ofType": {"name": "Team", "kind": "OBJECT"}},
+            },
+        ]
+    },
+    "types": [
+        # Interface: Component
+        {
+            "name": "Component",
+            "kind": "INTERFACE",
+            "description": "Base component interface",
+            "fields": [
+                {
+                    "name": "id",
+                    "args": [],
+                    "type": {
+                        "kind": "NON_NULL",
+                        "ofType": {"name": "ID", "kind": "SCALAR"},
+                    },
                 },
-                # Union: ApprovalChange
                 {
-                    "name": "ApprovalChange",
-                    "kind": "UNION",
-                    "possibleTypes": [{"name": "RequestToDelete"}, {"name": "RequestToUpdate"}],
+                    "name": "name",
+                    "args": [],
+                    "type": {
+                        "kind": "NON_NULL",
+                        "ofType": {"name": "String", "kind": "SCALAR"},
+                    },
                 },
-                # Object: Service (implements Component)
+                {"name": "team", "args": [], "type": {"name": "Team", "kind": "OBJECT"}},
                 {
-                    "name": "Service",
-                    "kind": "OBJECT",
-                    "interfaces": [{"name": "Component"}],
-                    "fields": [
-                        {
-                            "name": "id",
-                            "args": [],
-                            "type": {
-                                "kind": "NON_NULL",
-                                "ofType": {"name": "ID", "kind": "SCALAR"},
-                            },
-                        },
-                        {
-                            "name": "name",
-                            "args": [],
-                            "type": {
-                                "kind": "NON_NULL",
-                                "ofType": {"name": "String", "kind": "SCALAR"},
-                            },
-                        },
-                        {"name": "team", "args": [], "type": {"name": "Team", "kind": "OBJECT"}},
-                        {
-                            "name": "endpoint",
-                            "args": [],
-                            "type": {"name": "String", "kind": "SCALAR"},
-                            "description": "API endpoint",
-                        },
+                    "name": "repositories",
+                    "description": "Code repositories",
+                    "args": [
+                        {"name": "search", "type": {"name": "String", "kind": "SCALAR"}},
+                        {"name": "first", "type": {"name": "Int", "kind": "SCALAR"}},
                     ],
+                    "type": {"name": "ProjectConnection", "kind": "OBJECT"},
                 },
-                # Object: Team
+            ],
+            "possibleTypes": [{"name": "Service"}, {"name": "Job"}, {"name": "Library"}],
+        },
+        # Union: ApprovalChange
+        {
+            "name": "ApprovalChange",
+            "kind": "UNION",
+            "possibleTypes": [{"name": "RequestToDelete"}, {"name": "RequestToUpdate"}],
+        },
+        # Object: Service (implements Component)
+        {
+            "name": "Service",
+            "kind": "OBJECT",
+            "interfaces": [{"name": "Component"}],
+            "fields": [
                 {
-                    "name": "Team",
-                    "kind": "OBJECT",
-                    "fields": [
-                        {
-                            "name": "id",
-                            "args": [],
-                            "type": {
-                                "kind": "NON_NULL",
-                                "ofType": {"name": "ID", "kind": "SCALAR"},
-                            },
-                        },
-                        {
-                            "name": "name",
-                            "args": [],
-                            "type": {
-                                "kind": "NON_NULL",
-                                "ofType": {"name": "String", "kind": "SCALAR"},
-                            },
-                        },
-                        {
-                            "name": "components",
-                            "args": [{"name": "type", "type": {"name": "Type", "kind": "ENUM"}}],
-                            "type": {
-                                "kind": "LIST",
-                                "ofType": {"name": "Component", "kind": "INTERFACE"},
-                            },
-                        },
-                    ],
+                    "name": "id",
+                    "args": [],
+                    "type": {
+                        "kind": "NON_NULL",
+                        "ofType": {"name": "ID", "kind": "SCALAR"},
+                    },
+                },
+                {
+                    "name": "name",
+                    "args": [],
+                    "type": {
+                        "kind": "NON_NULL",
+                        "ofType": {"name": "String", "kind": "SCALAR"},
+                    },
                 },
-                # Enum: Type
+                {"name": "team", "args": [], "type": {"name": "Team", "kind": "OBJECT"}},
                 {
-                    "name": "Type",
-                    "kind": "ENUM",
-                    "enumValues": [{"name": "Service"}, {"name": "Job"}, {"name": "Library"}],
+                    "name": "endpoint",
+                    "args": [],
+                    "type": {"name": "String", "kind": "SCALAR"},
+                    "description": "API endpoint",
                 },
-                # Enum: Status
+            ],
+        },
+        # Object: Team
+        {
+            "name": "Team",
+            "kind": "OBJECT",
+            "fields": [
                 {
-                    "name": "LifecycleStatus",
-                    "kind": "ENUM",
-                    "enumValues": [{"name": "ACTIVE"}, {"name": "DEPRECATED"}],
+                    "name": "id",
+                    "args": [],
+                    "type": {
+                        "kind": "NON_NULL",
+                        "ofType": {"name": "ID", "kind": "SCALAR"},
+                    },
                 },
-                # Input: ComponentFilter
                 {
-                    "name": "ComponentFilter",
-                    "kind": "INPUT_OBJECT",
-                    "inputFields": [
-                        {"name": "type", "type": {"name": "Type", "kind": "ENUM"}},
-                        {"name": "teamId", "type": {"name": "ID", "kind": "SCALAR"}},
-                    ],
+                    "name": "name",
+                    "args": [],
+                    "type": {
+                        "kind": "NON_NULL",
+                        "ofType": {"name": "String", "kind": "SCALAR"},
+                    },
+                },
+                {
+                    "name": "components",
+                    "args": [{"name": "type", "type": {"name": "Type", "kind": "ENUM"}}],
+                    "type": {
+                        "kind": "LIST",
+                        "ofType": {"name": "Component", "kind": "INTERFACE"},
+                    },
                 },
             ],
-        }
+        },
+        # Enum: Type
+        {
+            "name": "Type",
+            "kind": "ENUM",
+            "enumValues": [{"name": "Service"}, {"name": "Job"}, {"name": "Library"}],
+        },
+        # Enum: Status
+        {
+            "name": "LifecycleStatus",
+            "kind": "ENUM",
+            "enumValues": [{"name": "ACTIVE"}, {"name": "DEPRECATED"}],
+        },
+        # Input: ComponentFilter
+        {
+            "name": "ComponentFilter",
+            "kind": "INPUT_OBJECT",
+            "inputFields": [
+                {"name": "type", "type": {"name": "Type", "kind": "ENUM"}},
+                {"name": "teamId", "type": {"name": "ID", "kind": "SCALAR"}},
+            ],
+        },
+    ],
+}
+
+
+class TestBuildSchemaContext:
+    """Test SDL context generation."""
+
+    @pytest.fixture
+    def sample_schema(self):
+        return _SAMPLE_SCHEMA
+
+    @pytest.fixture
+    def mutable_sample_schema(self):
+        return copy.deepcopy(_SAMPLE_SCHEMA)
 
     def test_queries_section(self, sample_schema):
         ctx = _build_schema_context(sample_schema)
@@ -344,6 +368,10 @@ class TestBuildSchemaContext:
         # Team.components has args
         assert "components(type: Type): [Component]" in ctx
 
+    def test_type_block_layout(self, sample_schema):
+        ctx = _build_schema_context(sample_schema)
+        assert "Team {\n  id: ID!\n  name: String!\n  components(type: Type): [Component]\n}" in ctx
+
     def test_enums_section(self, sample_schema):
         ctx = _build_schema_context(sample_schema)
         assert "<enums>" in ctx
@@ -356,21 +384,129 @@ class TestBuildSchemaContext:
         # Optional fields stripped - type and teamId not NON_NULL
         assert "ComponentFilter {  }" in ctx
 
-    def test_excludes_internal_types(self, sample_schema):
-        sample_schema["types"].append({"name": "__Schema", "kind": "OBJECT", "fields": []})
-        ctx = _build_schema_context(sample_schema)
+    def test_excludes_internal_types(self, mutable_sample_schema):
+        schema = mutable_sample_schema
+        schema["types"].append({"name": "__Schema", "kind": "OBJECT", "fields": []})
+        ctx = _build_schema_context(schema)
         assert "__Schema" not in ctx
 
-    def test_excludes_query_mutation_subscription(self, sample_schema):
-        sample_schema["types"].append({"name": "Query", "kind": "OBJECT", "fields": []})
-        sample_schema["types"].append({"name": "Mutation", "kind": "OBJECT", "fields": []})
-        ctx = _build_schema_context(sample_schema)
+    def test_excludes_query_mutation_subscription(self, mutable_sample_schema):
+        schema = mutable_sample_schema
+        schema["types"].append({"name": "Query", "kind": "OBJECT", "fields": []})
+        schema["types"].append({"name": "Mutation", "kind": "OBJECT", "fields": []})
+        ctx = _build_schema_context(schema)
         assert "\nQuery " not in ctx
         assert "\nMutation " not in ctx
 
+    def test_max_chars_truncates_on_line_boundary(self, sample_schema):
+        full = _build_schema_context(sample_schema)
+        ctx = _build_schema_context(sample_schema, max_chars=200)
+        assert ctx.endswith("[SCHEMA TRUNCATED - use search_schema() to explore]")
+        body = ctx.rsplit("\n", 1)[0]
+        assert len(body) <= 200
+        assert full.startswith(body + "\n")
+
+    def test_max_chars_not_reached(self, sample_schema):
+        full = _build_schema_context(sample_schema)
+        assert _build_schema_context(sample_schema, max_chars=len(full)) == full
+
+    def test_without_descriptions(self, sample_schema):
+        ctx = _build_schema_context(sample_schema, descriptions=False)
+        assert " # " not in ctx
+        assert "components() -> [Component!]!" in ctx
+        assert "endpoint: String" in ctx
+
     def test_empty_schema(self):
         ctx = _build_schema_context({})
         assert "<queries>" in ctx
         assert "<types>" in ctx
         assert "<enums>" in ctx
         assert "<inputs>" in ctx
+
+
+class TestSchemaCache:
+    """Test per-endpoint schema caching."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from api_agent.agent import graphql_agent
+
+        graphql_agent._schema_cache.clear()
+        yield
+        graphql_agent._schema_cache.clear()
+
+    @staticmethod
+    def _introspection():
+        return {
+            "success": True,
+            "data": {"__schema": {"queryType": {"fields": []}, "types": []}},
+        }
+
+    @pytest.mark.asyncio
+    async def test_reuses_cached_schema(self):
+        from unittest.mock import AsyncMock, patch
+
+        from api_agent.agent.graphql_agent import _fetch_schema_context
+
+        with patch(
+            "api_agent.agent.graphql_agent.graphql_fetch",
+            new_callable=AsyncMock,
+            return_value=self._introspection(),
+        ) as mock_fetch:
+            first = await _fetch_schema_context("https://api.example.com/graphql", {"a": "1"})
+            second = await _fetch_schema_context("https://api.example.com/graphql", {"a": "1"})
+
+        assert first == second
+        assert mock_fetch.await_count == 1
+        assert b'"queryType"' in first[1]()
+
+    @pytest.mark.asyncio
+    async def test_different_headers_not_shared(self):
+        from unittest.mock import AsyncMock, patch
+
+        from api_agent.agent.graphql_agent import _fetch_schema_context
+
+        with patch(
+            "api_agent.agent.graphql_agent.graphql_fetch",
+            new_callable=AsyncMock,
+            return_value=self._introspection(),
+        ) as mock_fetch:
+            await _fetch_schema_context("https://api.example.com/graphql", {"a": "1"})
+            await _fetch_schema_context("https://api.example.com/graphql", {"a": "2"})
+
+        assert mock_fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_refetched(self):
+        from unittest.mock import AsyncMock, patch
+
+        from api_agent.agent.graphql_agent import _fetch_schema_context
+
+        with (
+            patch(
+                "api_agent.agent.graphql_agent.graphql_fetch",
+                new_callable=AsyncMock,
+                return_value=self._introspection(),
+            ) as mock_fetch,
+            patch("api_agent.agent.graphql_agent.settings.SCHEMA_CACHE_TTL_SECONDS", 0),
+        ):
+            await _fetch_schema_context("https://api.example.com/graphql", None)
+            await _fetch_schema_context("https://api.example.com/graphql", None)
+
+        assert mock_fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_not_cached(self):
+        from unittest.mock import AsyncMock, patch
+
+        from api_agent.agent import graphql_agent
+
+        with patch(
+            "api_agent.agent.graphql_agent.graphql_fetch",
+            new_callable=AsyncMock,
+            return_value={"success": False, "error": "HTTP 500"},
+        ):
+            ctx = await graphql_agent._fetch_schema_context("https://api.example.com/graphql", None)
+
+        assert ctx == ("", None)
+        assert not graphql_agent._schema_cache
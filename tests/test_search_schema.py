@@ -202,6 +202,109 @@ class TestSearchSchema:
         assert line_numbers == sorted(line_numbers)
 
 
+class TestSearchSchemaBytes:
+    """Test search_schema on UTF-8 bytes schema (GraphQL stores raw JSON as bytes)."""
+
+    def test_bytes_schema(self):
+        _raw_schema.set('{\n  "name": "Café",\n  "kind": "OBJECT"\n}'.encode())
+
+        result = _search_schema_impl("café", context=0)
+
+        assert result.startswith("(1 matches")
+        assert '2:  "name": "Café",' in result
+
+    def test_non_ascii_pattern_folds_case(self):
+        _raw_schema.set('{\n  "name": "CAFÉ",\n  "enum": "ÜBER"\n}'.encode())
+
+        result = _search_schema_impl("café|über", context=0)
+
+        assert result.startswith("(2 matches")
+        assert '2:  "name": "CAFÉ",' in result
+        assert '3:  "enum": "ÜBER"' in result
+
+    def test_regex_on_non_ascii_schema_matches_whole_chars(self):
+        _raw_schema.set('{\n  "a": "x",\n  "name": "Café"\n}'.encode())
+
+        result = _search_schema_impl(r'"caf."$', context=0)
+
+        assert result.startswith("(1 matches")
+        assert '3:  "name": "Café"' in result
+
+    def test_lazy_dump_schema(self):
+        from api_agent.json_utils import LazyDump
+
+        lazy = LazyDump({"name": "Query", "kind": "OBJECT"}, indent=True)
+        _raw_schema.set(lazy)
+
+        result = _search_schema_impl("query", context=0)
+
+        assert '2:  "name": "Query",' in result
+        assert lazy() is lazy()
+
+
+class TestSearchSchemaLineIndex:
+    """Test search over pre-indexed line offsets."""
+
+    def test_offsets_reused_across_pages(self):
+        from unittest.mock import patch
+
+        from api_agent.agent import schema_search
+        from api_agent.agent.schema_search import SchemaIndex
+
+        index = SchemaIndex(b"\n".join(b'"name": "T%d"' % i for i in range(50)))
+        _raw_schema.set(index)
+
+        with patch.object(
+            schema_search, "_line_offsets", wraps=schema_search._line_offsets
+        ) as line_offsets:
+            _search_schema_impl("name", context=0, max_chars=200)
+            _search_schema_impl("name", context=0, offset=10, max_chars=200)
+
+        assert line_offsets.call_count == 1
+
+    def test_str_schema_encoded_once(self):
+        from api_agent.agent.schema_search import SchemaIndex
+
+        index = SchemaIndex('"name": "Query"\n"name": "Hotel"')
+        _raw_schema.set(index)
+
+        first = _search_schema_impl("hotel", context=0)
+        data = index.data
+        second = _search_schema_impl("hotel", context=0)
+
+        assert first == second
+        assert index.data is data
+
+    def test_match_spanning_newline_ignored(self):
+        _raw_schema.set(b"alpha\nbeta\nalpha beta")
+
+        result = _search_schema_impl(r"alpha\s+beta", context=0)
+
+        assert result.startswith("(1 matches")
+        assert "3:alpha beta" in result
+
+    def test_anchors_are_per_line(self):
+        _raw_schema.set(b"  x\nkind\n  kind")
+
+        result = _search_schema_impl("^kind$", context=0)
+
+        assert result.startswith("(1 matches")
+        assert "2:kind" in result
+
+    def test_plain_word_skips_regex_engine(self):
+        from unittest.mock import patch
+
+        _raw_schema.set(b"HotelSearch\nflight\nhotel_id")
+
+        with patch("api_agent.agent.schema_search.re.compile") as compile_:
+            result = _search_schema_impl("hotel", context=0)
+
+        compile_.assert_not_called()
+        assert result.startswith("(2 matches")
+        assert "1:HotelSearch" in result
+        assert "3:hotel_id" in result
+
+
 class TestSearchSchemaNoContext:
     """Test search_schema without schema loaded."""
 
@@ -212,3 +315,42 @@ class TestSearchSchemaNoContext:
         result = _search_schema_impl("test")
 
         assert "error: schema empty" in result
+
+
+class TestSearchLoadedGraphQLSchema:
+    """Test search over the raw schema as stored by GraphQL introspection loading."""
+
+    @pytest.mark.asyncio
+    async def test_large_introspection_searchable(self):
+        from unittest.mock import AsyncMock, patch
+
+        from api_agent.agent.graphql_agent import _load_schema_context
+
+        types = [
+            {
+                "name": f"Type{i}",
+                "kind": "OBJECT",
+                "description": "x" * 200,
+                "fields": [
+                    {"name": f"hotelField{i}", "type": {"name": "String", "kind": "SCALAR"}}
+                ],
+            }
+            for i in range(500)
+        ]
+        schema = {"queryType": {"fields": []}, "types": types}
+        introspection = {"success": True, "data": {"__schema": schema}}
+
+        with patch(
+            "api_agent.agent.graphql_agent.graphql_fetch",
+            new_callable=AsyncMock,
+            return_value=introspection,
+        ):
+            _, raw_json = await _load_schema_context("https://api.example.com/graphql", None)
+
+        assert len(raw_json()) > 32000
+        _raw_schema.set(raw_json)
+
+        result = _search_schema_impl('"hotelField42"', context=0)
+
+        assert result.startswith("(1 matches")
+        assert '"name": "hotelField42"' in result